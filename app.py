@@ -20,17 +20,18 @@ Date: 2026
 """
 
 import streamlit as st
-import extra_streamlit_components as stx
-from database import test_connection, initialize_database, execute_schema_file, check_tables_exist
+from database import (
+    test_connection, initialize_database, execute_schema_file, check_tables_exist,
+    ensure_summary_tables, ensure_indexes
+)
 from auth import (
     register_designer, login_designer, login_client,
     create_session, save_session_to_cookie, load_session_from_cookie,
-    logout, is_logged_in, is_designer, is_client, get_cookie_manager
+    logout, is_logged_in, get_current_role, get_cookie_manager
 )
-from designer_dashboard import show_designer_dashboard
-from client_dashboard import show_client_dashboard
-from utils import validate_email, validate_password, show_success, show_error, show_info
+from utils import validate_email, validate_password, show_success, show_error, show_info, show_warning
 import config
+import importlib
 import os
 
 # =====================================================
@@ -48,34 +49,68 @@ st.set_page_config(
 # CUSTOM CSS STYLING
 # =====================================================
 
+# Built once at import time; only the render call happens per rerun
+CUSTOM_CSS = """
+    <style>
+    .main-header {
+        font-size: 2.5rem;
+        font-weight: bold;
+        color: #1f77b4;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .stButton>button {
+        width: 100%;
+    }
+    .success-box {
+        padding: 1rem;
+        background-color: #d4edda;
+        border: 1px solid #c3e6cb;
+        border-radius: 5px;
+        margin: 1rem 0;
+    }
+    </style>
+"""
+
 def load_css():
-    """Apply custom CSS styling"""
-    st.markdown("""
-        <style>
-        .main-header {
-            font-size: 2.5rem;
-            font-weight: bold;
-            color: #1f77b4;
-            text-align: center;
-            margin-bottom: 2rem;
-        }
-        .stButton>button {
-            width: 100%;
-        }
-        .success-box {
-            padding: 1rem;
-            background-color: #d4edda;
-            border: 1px solid #c3e6cb;
-            border-radius: 5px;
-            margin: 1rem 0;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    """
+    Apply custom CSS styling
+    Must be emitted on every rerun - Streamlit drops elements that a
+    rerun does not render, so a one-shot session flag would lose the styles
+    """
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # =====================================================
 # INITIALIZATION
 # =====================================================
 
+@st.cache_resource
+def ensure_upload_directories():
+    """
+    Create upload directories once per process
+    """
+    config.create_upload_directories()
+    return True
+
+def get_database_status():
+    """
+    Check database connectivity and schema
+    Not cached, so a failed probe never outlives the outage; it runs only
+    until db_initialized is set and check_tables_exist() memoizes success
+    
+    Returns:
+        Tuple (connected: bool, tables_exist: bool)
+    """
+    if not test_connection():
+        return False, False
+    try:
+        tables_exist = check_tables_exist()
+    except Exception as e:
+        # Show the setup page rather than re-running the schema on a failed lookup
+        print(f"Error checking tables: {e}")
+        return False, False
+    return True, tables_exist
+
 def initialize_app():
     """
     Initialize the application
@@ -83,17 +118,15 @@ def initialize_app():
     - Initialize session state
     - Load cookie manager
     """
-    # Create upload directories
-    if not os.path.exists(config.BASE_UPLOAD_DIR):
-        config.create_upload_directories()
+    # Create upload directories (runs once per process)
+    ensure_upload_directories()
     
     # Initialize session state
     if 'initialized' not in st.session_state:
         st.session_state['initialized'] = True
     
-    # Initialize cookie manager
-    if 'cookie_manager' not in st.session_state:
-        st.session_state['cookie_manager'] = get_cookie_manager()
+    # Initialize cookie manager (created once per session)
+    get_cookie_manager()
 
 # =====================================================
 # AUTHENTICATION PAGES
@@ -137,7 +170,7 @@ def show_designer_login():
                     if success:
                         create_session(user_data)
                         if remember_me:
-                            save_session_to_cookie(st.session_state['cookie_manager'], user_data)
+                            save_session_to_cookie(get_cookie_manager(), user_data)
                         show_success(message)
                         st.rerun()
                     else:
@@ -192,7 +225,7 @@ def show_client_login():
                 if success:
                     create_session(user_data)
                     if remember_me:
-                        save_session_to_cookie(st.session_state['cookie_manager'], user_data)
+                        save_session_to_cookie(get_cookie_manager(), user_data)
                     show_success(message)
                     st.rerun()
                 else:
@@ -202,6 +235,12 @@ def show_client_login():
 # MAIN APPLICATION ROUTING
 # =====================================================
 
+# Role -> (module, function) of the dashboard to render
+DASHBOARD_ROUTES = {
+    'designer': ('designer_dashboard', 'show_designer_dashboard'),
+    'client': ('client_dashboard', 'show_client_dashboard')
+}
+
 def show_main_app():
     """
     Main application logic
@@ -211,19 +250,20 @@ def show_main_app():
     with st.sidebar:
         st.write("---")
         if st.button("🚪 Logout", type="secondary", use_container_width=True):
-            logout(st.session_state['cookie_manager'])
+            logout(get_cookie_manager())
             show_success("Logged out successfully!")
             st.rerun()
     
-    # Route to appropriate dashboard
-    if is_designer():
-        show_designer_dashboard()
-    elif is_client():
-        show_client_dashboard()
-    else:
+    # Route to appropriate dashboard with a single role lookup
+    route = DASHBOARD_ROUTES.get(get_current_role())
+    if route is None:
         show_error("Invalid user role")
-        logout(st.session_state['cookie_manager'])
+        logout(get_cookie_manager())
         st.rerun()
+    
+    # Dashboards are imported lazily so the login page doesn't pay for them
+    module_name, function_name = route
+    getattr(importlib.import_module(module_name), function_name)()
 
 # =====================================================
 # DATABASE SETUP PAGE
@@ -309,7 +349,7 @@ Password: {'***' if config.DB_CONFIG.get('password') else 'NOT SET'}
                     
                     # Execute schema
                     schema_path = os.path.join(os.path.dirname(__file__), 'database_schema.sql')
-                    if execute_schema_file(schema_path):
+                    if execute_schema_file(schema_path) and ensure_summary_tables():
                         show_success("✓ Database schema created successfully!")
                         st.balloons()
                         
@@ -343,13 +383,15 @@ def main():
     
     # Check if database and tables exist
     if not st.session_state.get('db_initialized', False):
+        connected, tables_exist = get_database_status()
+        
         # Test connection first
-        if not test_connection():
+        if not connected:
             show_setup_page()
             return
         
         # Check if tables exist
-        if not check_tables_exist():
+        if not tables_exist:
             st.warning("⚠️ Database tables not found. Initializing database...")
             st.info("Please wait while we create the necessary tables...")
             
@@ -361,7 +403,7 @@ def main():
             
             with progress_placeholder:
                 with st.spinner("Creating database tables... This may take a moment..."):
-                    if execute_schema_file(schema_path):
+                    if execute_schema_file(schema_path) and ensure_summary_tables():
                         st.session_state['db_initialized'] = True
                         show_success("✓ Database tables created successfully!")
                         config.create_upload_directories()
@@ -384,11 +426,24 @@ def main():
                             show_setup_page()
                         st.stop()
         else:
+            # Upgrades add the summary tables in place, never via the full schema
+            if not ensure_summary_tables():
+                show_error("❌ Failed to create the summary tables.")
+                st.error("Please check that:")
+                st.markdown("""
+                1. The MySQL user has the CREATE and TRIGGER privileges
+                2. With binary logging on, `log_bin_trust_function_creators` is enabled
+                3. `database_summary_tables.sql` runs cleanly when applied manually
+                """)
+                st.stop()
+            if not ensure_indexes():
+                # Searches fall back to slower queries, so keep going
+                show_warning("Some database indexes could not be added; searches may be slower.")
             st.session_state['db_initialized'] = True
     
     # Try to load session from cookie
     if not is_logged_in():
-        load_session_from_cookie(st.session_state['cookie_manager'])
+        load_session_from_cookie(get_cookie_manager())
     
     # Route to appropriate page
     if is_logged_in():
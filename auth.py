@@ -5,11 +5,11 @@ Handles user registration, login, logout, and session management with cookies
 
 import streamlit as st
 import bcrypt
+import base64
 import secrets
-import string
-from datetime import datetime, timedelta
-import extra_streamlit_components as stx
-from database import insert_record, get_records, execute_query
+from datetime import datetime, timedelta, timezone
+import jwt
+from database import insert_record, get_records, clear_cached_reads, execute_query
 import config
 
 # =====================================================
@@ -19,8 +19,13 @@ import config
 def get_cookie_manager():
     """
     Initialize and return the cookie manager
+    Kept in session state: each browser session needs its own manager,
+    since it holds that browser's cookies
     """
-    return stx.CookieManager()
+    if 'cookie_manager' not in st.session_state:
+        import extra_streamlit_components as stx
+        st.session_state['cookie_manager'] = stx.CookieManager()
+    return st.session_state['cookie_manager']
 
 # =====================================================
 # PASSWORD HASHING FUNCTIONS
@@ -29,6 +34,7 @@ def get_cookie_manager():
 def hash_password(password):
     """
     Hash a password using bcrypt
+    Cost factor is taken from config.BCRYPT_ROUNDS
     
     Args:
         password: Plain text password
@@ -36,7 +42,7 @@ def hash_password(password):
     Returns:
         Hashed password string
     """
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=config.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
@@ -57,22 +63,35 @@ def verify_password(password, hashed_password):
 # CLIENT CODE GENERATION
 # =====================================================
 
-def generate_client_code():
+def generate_client_code(batch_size=8):
     """
     Generate a unique random client access code
-    Format: 8 uppercase letters and digits (e.g., ABC12345)
+    Format: 8 characters from A-Z and 2-7 (e.g., K7QZ2MXA)
+    
+    Candidates are generated in batches and checked for uniqueness
+    with a single query per batch
+    
+    Args:
+        batch_size: Number of candidate codes to check per query
     
     Returns:
         Unique client code string
     """
     while True:
-        # Generate random 8-character code
-        code = ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(8))
+        # Generate a batch of random 8-character codes from one urandom read
+        # (every 5 random bytes base32-encode to exactly 8 chars of A-Z2-7)
+        encoded = base64.b32encode(secrets.token_bytes(5 * batch_size)).decode('ascii')
+        candidates = [encoded[i:i + 8] for i in range(0, len(encoded), 8)]
         
-        # Check if code already exists
-        existing = get_records('users', 'client_code = %s', (code,))
-        if not existing:
-            return code
+        # Check which codes already exist
+        placeholders = ', '.join(['%s'] * len(candidates))
+        existing = get_records('users', f'client_code IN ({placeholders})',
+                               tuple(candidates), columns='client_code')
+        taken = {row['client_code'] for row in existing}
+        
+        for code in candidates:
+            if code not in taken:
+                return code
 
 # =====================================================
 # USER REGISTRATION FUNCTIONS
@@ -122,12 +141,13 @@ def register_client(name, email, designer_id):
         designer_id: ID of the designer creating this client
     
     Returns:
-        Tuple (success: bool, message: str, client_code: str or None)
+        Tuple (success: bool, message: str, client_code: str or None,
+               client_id: int or None)
     """
     # Check if email already exists
     existing_user = get_records('users', 'email = %s', (email,))
     if existing_user:
-        return False, "Email already registered", None
+        return False, "Email already registered", None, None
     
     # Generate unique client code
     client_code = generate_client_code()
@@ -142,9 +162,9 @@ def register_client(name, email, designer_id):
         }
         user_id = insert_record('users', user_data)
         
-        return True, f"Client account created! Access code: {client_code}", client_code
+        return True, f"Client account created! Access code: {client_code}", client_code, user_id
     except Exception as e:
-        return False, f"Error creating client account: {str(e)}", None
+        return False, f"Error creating client account: {str(e)}", None, None
 
 # =====================================================
 # LOGIN FUNCTIONS
@@ -161,8 +181,10 @@ def login_designer(email, password):
     Returns:
         Tuple (success: bool, message: str, user_data: dict or None)
     """
-    # Fetch user from database
-    user = get_records('users', 'email = %s AND role = %s', (email, 'designer'))
+    # Fetch user from database (uncached: password hashes must not sit in a
+    # process-wide cache shared by every session)
+    user = get_records('users', 'email = %s AND role = %s', (email, 'designer'),
+                       columns='id, name, email, role, password_hash')
     
     if not user:
         return False, "Invalid email or password", None
@@ -199,6 +221,12 @@ def login_client(email, client_code):
 # SESSION MANAGEMENT
 # =====================================================
 
+# Session state keys tied to the logged-in user (cleared on logout)
+USER_SESSION_KEYS = (
+    'logged_in', 'user_id', 'user_name', 'user_email', 'user_role',
+    'client_code', 'client_project_id', 'active_project', 'editing_suppliers'
+)
+
 def create_session(user_data):
     """
     Create a session for logged-in user
@@ -226,15 +254,26 @@ def save_session_to_cookie(cookie_manager, user_data):
         user_data: User information to store
     """
     try:
-        # Create session token
-        session_token = f"{user_data['id']}:{user_data['role']}:{user_data['email']}"
+        expires_at = datetime.now(timezone.utc) + timedelta(days=config.COOKIE_EXPIRY_DAYS)
+        
+        # Create signed session token (verified without a database lookup)
+        payload = {
+            'id': user_data['id'],
+            'name': user_data['name'],
+            'email': user_data['email'],
+            'role': user_data['role'],
+            'exp': expires_at
+        }
+        if user_data['role'] == 'client':
+            payload['client_code'] = user_data.get('client_code')
+        session_token = jwt.encode(payload, config.COOKIE_KEY, algorithm='HS256')
         
         # Set cookie with expiry
         cookie_manager.set(
             config.COOKIE_NAME,
             session_token,
-            expires_at=datetime.now() + timedelta(days=config.COOKIE_EXPIRY_DAYS),
-            key=config.COOKIE_KEY
+            expires_at=expires_at,
+            key="set_session_cookie"
         )
     except Exception as e:
         print(f"Error saving cookie: {e}")
@@ -258,17 +297,17 @@ def load_session_from_cookie(cookie_manager):
         if not session_token:
             return False
         
-        # Parse session token
-        user_id, role, email = session_token.split(':')
-        
-        # Fetch user from database
-        user = get_records('users', 'id = %s AND email = %s AND role = %s', 
-                          (int(user_id), email, role))
-        
-        if user:
-            create_session(user[0])
-            return True
-        
+        # Verify signature and expiry, then restore session from the token
+        user_data = jwt.decode(session_token, config.COOKIE_KEY, algorithms=['HS256'])
+        create_session(user_data)
+        return True
+    except jwt.InvalidTokenError:
+        # Expired, tampered or legacy "id:role:email" token - drop it so it
+        # isn't re-parsed on every rerun, and require a fresh login
+        try:
+            cookie_manager.delete(config.COOKIE_NAME)
+        except Exception:
+            pass
         return False
     except Exception as e:
         print(f"Error loading session from cookie: {e}")
@@ -281,9 +320,13 @@ def logout(cookie_manager):
     Args:
         cookie_manager: Cookie manager instance
     """
-    # Clear session state
-    for key in list(st.session_state.keys()):
-        del st.session_state[key]
+    # Drop cached user/project lookups
+    clear_cached_reads()
+    
+    # Clear user-specific session state (app-level keys such as
+    # db_initialized are kept so the next rerun doesn't redo setup)
+    for key in USER_SESSION_KEYS:
+        st.session_state.pop(key, None)
     
     # Clear cookie
     try:
@@ -304,6 +347,16 @@ def is_logged_in():
     """
     return st.session_state.get('logged_in', False)
 
+def get_current_role():
+    """
+    Get the logged-in user's role with a single session-state check
+    
+    Returns:
+        'designer', 'client' or None if not logged in
+    """
+    state = st.session_state
+    return state.get('user_role') if state.get('logged_in', False) else None
+
 def is_designer():
     """
     Check if logged-in user is a designer
@@ -311,7 +364,7 @@ def is_designer():
     Returns:
         Boolean
     """
-    return is_logged_in() and st.session_state.get('user_role') == 'designer'
+    return get_current_role() == 'designer'
 
 def is_client():
     """
@@ -320,7 +373,7 @@ def is_client():
     Returns:
         Boolean
     """
-    return is_logged_in() and st.session_state.get('user_role') == 'client'
+    return get_current_role() == 'client'
 
 def require_login():
     """
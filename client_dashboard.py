@@ -3,12 +3,17 @@ Client Dashboard Module
 Contains all functionality for the client's dashboard (mostly view-only)
 """
 
+import os
 import streamlit as st
-from database import get_records, insert_record, execute_query
+from itertools import groupby
+from operator import itemgetter
+from database import (
+    get_records, cached_get_records, get_client_project_with_designer, get_task_summary,
+    get_timeline_status_counts, get_gallery_counts, get_budget_totals, insert_record, insert_many, execute_query
+)
 from utils import (
-    display_image, format_currency, format_date, format_datetime,
-    show_success, show_error, show_info, calculate_budget_statistics,
-    calculate_task_completion, save_uploaded_file
+    display_image, format_currency, format_date, format_datetime, format_label,
+    show_success, show_error, show_info, save_uploaded_files
 )
 import config
 
@@ -26,22 +31,19 @@ def show_client_dashboard():
     
     # Get client's project
     client_id = st.session_state.get('user_id')
-    project = get_records('projects', 'client_id = %s', (client_id,))
+    project = get_client_project_with_designer(client_id)
     
     if not project:
         st.error("No project found for your account. Please contact your designer.")
         return
     
-    project = project[0]
     project_id = project['id']
     
     # Store project info in session
     st.session_state['client_project_id'] = project_id
     
-    # Get designer info
-    designer = get_records('users', 'id = %s', (project['designer_id'],))
-    if designer:
-        st.sidebar.info(f"📧 Your Designer: {designer[0]['name']}\n{designer[0]['email']}")
+    # Show designer info (joined into the project row)
+    st.sidebar.info(f"📧 Your Designer: {project['designer_name']}\n{project['designer_email']}")
     
     # Navigation menu
     menu_options = [
@@ -83,19 +85,14 @@ def show_client_reference_library(project_id):
     st.header("📚 Reference Library")
     st.caption("View reference images organized by room")
     
-    references = get_records('reference_library', 'project_id = %s', (project_id,))
+    references = get_records('reference_library',
+                             'project_id = %s ORDER BY room_name, id',
+                             (project_id,),
+                             columns='room_name, file_path')
     
     if references:
-        # Group by room
-        rooms = {}
-        for ref in references:
-            room = ref['room_name']
-            if room not in rooms:
-                rooms[room] = []
-            rooms[room].append(ref)
-        
-        # Display by room
-        for room, images in rooms.items():
+        # Display by room (rows arrive sorted by room, so group in one pass)
+        for room, images in groupby(references, key=itemgetter('room_name')):
             st.subheader(f"🏠 {room}")
             cols = st.columns(3)
             for idx, img in enumerate(images):
@@ -116,35 +113,32 @@ def show_client_task_progress(project_id):
     st.header("✅ Task Progress")
     st.caption("View project task completion status")
     
-    tasks = get_records('tasks', 'project_id = %s', (project_id,))
+    summary = get_task_summary(project_id)
     
-    if tasks:
+    if summary['total']:
         # Show overall progress
-        overall_progress = calculate_task_completion(tasks)
+        overall_progress = summary['average_progress']
         st.metric("Overall Project Completion", f"{overall_progress:.1f}%")
         st.progress(overall_progress / 100)
         
         st.divider()
         
-        # Group tasks by progress
-        completed_tasks = [t for t in tasks if t['progress_percent'] == 100]
-        in_progress_tasks = [t for t in tasks if 0 < t['progress_percent'] < 100]
-        pending_tasks = [t for t in tasks if t['progress_percent'] == 0]
-        
         # Display summary
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("✅ Completed", len(completed_tasks))
+            st.metric("✅ Completed", summary['completed'])
         with col2:
-            st.metric("🔄 In Progress", len(in_progress_tasks))
+            st.metric("🔄 In Progress", summary['in_progress'])
         with col3:
-            st.metric("⏳ Pending", len(pending_tasks))
+            st.metric("⏳ Pending", summary['pending'])
         
         st.divider()
         
         # Display tasks
         st.subheader("📋 Task List")
         
+        tasks = get_records('tasks', 'project_id = %s', (project_id,),
+                            columns='title, description, progress_percent, comments')
         for task in tasks:
             status_emoji = '✅' if task['progress_percent'] == 100 else '🔄' if task['progress_percent'] > 0 else '⏳'
             
@@ -170,11 +164,12 @@ def show_client_budget_overview(project_id):
     st.header("💰 Budget Overview")
     st.caption("View project budget and expenses")
     
-    budget_items = get_records('budget_items', 'project_id = %s', (project_id,))
+    budget_items = cached_get_records('budget_items', 'project_id = %s', (project_id,),
+                                      columns='item_name, estimated_cost, actual_cost')
     
     if budget_items:
-        # Calculate statistics
-        stats = calculate_budget_statistics(budget_items)
+        # Totals are summed in SQL
+        stats = get_budget_totals(project_id)
         
         # Display summary metrics
         col1, col2, col3 = st.columns(3)
@@ -215,31 +210,55 @@ def show_client_measurements(project_id):
     st.header("📐 Measurements & Drawings")
     st.caption("View site measurements and design drawings")
     
+    # Fetch both tabs' drawings in one query and split by type
+    all_measurements = cached_get_records('measurements', 'project_id = %s', (project_id,),
+                                          columns='id, type, file_path, notes, uploaded_at')
+    by_type = {'existing': [], 'proposed': []}
+    for measurement in all_measurements:
+        by_type[measurement['type']].append(measurement)
+    
     tab1, tab2 = st.tabs(["📏 Existing Site Drawings", "🎨 Proposed Design Drawings"])
     
     with tab1:
-        show_client_measurement_tab(project_id, 'existing')
+        show_client_measurement_tab(project_id, 'existing', prefetched=by_type['existing'])
     
     with tab2:
-        show_client_measurement_tab(project_id, 'proposed')
+        show_client_measurement_tab(project_id, 'proposed', prefetched=by_type['proposed'])
 
-def show_client_measurement_tab(project_id, measurement_type):
-    """Display measurement tab for clients"""
+def show_client_measurement_tab(project_id, measurement_type, prefetched=None):
+    """
+    Display measurement tab for clients
+    
+    Args:
+        project_id: Project ID
+        measurement_type: 'existing' or 'proposed'
+        prefetched: Optional list of measurement rows already loaded by the caller
+    """
     type_title = "Existing Site" if measurement_type == 'existing' else "Proposed Design"
     
-    measurements = get_records('measurements', 
-                              'project_id = %s AND type = %s', 
-                              (project_id, measurement_type))
+    if prefetched is not None:
+        measurements = prefetched
+    else:
+        measurements = cached_get_records('measurements', 
+                                          'project_id = %s AND type = %s', 
+                                          (project_id, measurement_type),
+                                          columns='id, file_path, notes, uploaded_at')
     
     if measurements:
         for measurement in measurements:
             with st.expander(f"📄 Drawing - {format_datetime(measurement['uploaded_at'])}"):
                 # Display image if it's an image file
-                file_ext = measurement['file_path'].split('.')[-1].lower()
-                if file_ext in ['png', 'jpg', 'jpeg', 'gif']:
-                    display_image(measurement['file_path'])
+                file_ext = os.path.splitext(measurement['file_path'])[1][1:].lower()
+                if file_ext in config.PREVIEWABLE_IMAGE_EXTENSIONS:
+                    # Expander bodies always run, so only load the image on request
+                    if st.toggle("Show drawing", key=f"show_meas_{measurement['id']}"):
+                        # Thumbnail written at upload time; decode the original only on request
+                        if st.toggle("View full size", key=f"full_meas_{measurement['id']}"):
+                            display_image(measurement['file_path'])
+                        else:
+                            display_image(measurement['file_path'], width=config.THUMBNAIL_SIZE[0])
                 else:
-                    st.info(f"📎 File: {measurement['file_path'].split('/')[-1]}")
+                    st.info(f"📎 File: {os.path.basename(measurement['file_path'])}")
                 
                 if measurement['notes']:
                     st.write(f"**Notes:** {measurement['notes']}")
@@ -268,49 +287,63 @@ def show_client_gallery(project_id):
     )
     
     if st.button("Upload Images", type="primary") and uploaded_files:
-        for uploaded_file in uploaded_files:
-            file_path = save_uploaded_file(uploaded_file, project_id, 'gallery')
-            if file_path:
-                gallery_data = {
-                    'project_id': project_id,
-                    'uploaded_by': 'client',
-                    'file_path': file_path
-                }
-                insert_record('gallery', gallery_data)
-        show_success(f"{len(uploaded_files)} image(s) uploaded successfully!")
-        st.rerun()
+        # Write files concurrently, then insert all rows in one statement
+        file_paths, errors = save_uploaded_files(uploaded_files, project_id, 'gallery')
+        
+        gallery_rows = [
+            {'project_id': project_id, 'uploaded_by': 'client', 'file_path': file_path}
+            for file_path in file_paths
+        ]
+        insert_many('gallery', gallery_rows)
+        
+        if errors:
+            # Worker threads can't render errors, so report them here
+            show_error(f"{len(errors)} image(s) could not be saved: {'; '.join(errors)}")
+        if gallery_rows:
+            show_success(f"{len(gallery_rows)} image(s) uploaded successfully!")
+            st.rerun()
     
     st.divider()
     
     # Display all gallery images
     st.subheader("🖼️ Gallery")
     
-    gallery_items = get_records('gallery', 'project_id = %s ORDER BY uploaded_at DESC', (project_id,))
+    counts = get_gallery_counts(project_id)
     
-    if gallery_items:
-        # Separate by uploader
-        client_images = [g for g in gallery_items if g['uploaded_by'] == 'client']
-        designer_images = [g for g in gallery_items if g['uploaded_by'] == 'designer']
+    if counts['client'] or counts['designer']:
+        # Only the selected section is rendered (st.tabs would load every image)
+        # Options stay fixed so an upload changing a count keeps the selection
+        labels = {'client': "Your Uploads", 'designer': "Designer's Selections"}
+        uploaded_by = st.radio("Show", ['client', 'designer'],
+                               format_func=lambda option: f"{labels[option]} ({counts[option]})",
+                               horizontal=True, label_visibility="collapsed",
+                               key="client_gallery_view")
         
-        tab1, tab2 = st.tabs([f"Your Uploads ({len(client_images)})", f"Designer's Selections ({len(designer_images)})"])
+        if uploaded_by == 'client':
+            empty_message = "You haven't uploaded any images yet."
+        else:
+            empty_message = "Designer hasn't uploaded any images yet."
         
-        with tab1:
-            if client_images:
-                cols = st.columns(3)
-                for idx, img in enumerate(client_images):
-                    with cols[idx % 3]:
-                        display_image(img['file_path'], width=200)
-            else:
-                show_info("You haven't uploaded any images yet.")
+        # Fetch one page at a time; "Load more" grows the limit
+        limit_key = f"gallery_limit_{uploaded_by}"
+        limit = st.session_state.get(limit_key, config.GALLERY_PAGE_SIZE)
+        images = cached_get_records('gallery',
+                                    'project_id = %s AND uploaded_by = %s ORDER BY uploaded_at DESC',
+                                    (project_id, uploaded_by),
+                                    columns='file_path', limit=limit)
         
-        with tab2:
-            if designer_images:
-                cols = st.columns(3)
-                for idx, img in enumerate(designer_images):
-                    with cols[idx % 3]:
-                        display_image(img['file_path'], width=200)
-            else:
-                show_info("Designer hasn't uploaded any images yet.")
+        if images:
+            cols = st.columns(3)
+            for idx, img in enumerate(images):
+                with cols[idx % 3]:
+                    display_image(img['file_path'], width=200)
+            
+            if counts[uploaded_by] > limit:
+                if st.button("Load more", key=f"more_{limit_key}"):
+                    st.session_state[limit_key] = limit + config.GALLERY_PAGE_SIZE
+                    st.rerun()
+        else:
+            show_info(empty_message)
     else:
         show_info("No gallery images yet. Upload your inspiration above!")
 
@@ -325,22 +358,21 @@ def show_client_timeline(project_id):
     st.header("📅 Timeline Tracker")
     st.caption("View project milestones and deadlines")
     
-    timeline_items = get_records('timeline', 'project_id = %s ORDER BY deadline', (project_id,))
+    timeline_items = cached_get_records('timeline', 'project_id = %s ORDER BY deadline', (project_id,),
+                                        columns='milestone, deadline, status')
     
     if timeline_items:
-        # Summary metrics
+        # Summary metrics (counted in SQL)
         col1, col2, col3 = st.columns(3)
         
-        pending = len([t for t in timeline_items if t['status'] == 'pending'])
-        in_progress = len([t for t in timeline_items if t['status'] == 'in_progress'])
-        completed = len([t for t in timeline_items if t['status'] == 'completed'])
+        counts = get_timeline_status_counts(project_id)
         
         with col1:
-            st.metric("⏳ Pending", pending)
+            st.metric("⏳ Pending", counts['pending'])
         with col2:
-            st.metric("🔄 In Progress", in_progress)
+            st.metric("🔄 In Progress", counts['in_progress'])
         with col3:
-            st.metric("✅ Completed", completed)
+            st.metric("✅ Completed", counts['completed'])
         
         st.divider()
         
@@ -348,21 +380,9 @@ def show_client_timeline(project_id):
         st.subheader("📋 Project Milestones")
         
         for item in timeline_items:
-            status_emoji = {
-                'pending': '⏳',
-                'in_progress': '🔄',
-                'completed': '✅'
-            }
-            
-            status_color = {
-                'pending': 'orange',
-                'in_progress': 'blue',
-                'completed': 'green'
-            }
-            
-            st.markdown(f"### {status_emoji[item['status']]} {item['milestone']}")
+            st.markdown(f"### {config.TIMELINE_STATUS_EMOJI[item['status']]} {item['milestone']}")
             st.markdown(f"**Deadline:** {format_date(item['deadline'])}")
-            st.markdown(f"**Status:** :{status_color[item['status']]}[{item['status'].replace('_', ' ').title()}]")
+            st.markdown(f"**Status:** :{config.TIMELINE_STATUS_COLOR[item['status']]}[{format_label(item['status'])}]")
             st.divider()
     else:
         show_info("Timeline will be available soon.")
@@ -382,11 +402,11 @@ def show_client_feedback(project_id):
     st.subheader("➕ Submit Feedback")
     
     with st.form("client_feedback"):
-        item_type = st.selectbox("Feedback Type", ["drawing", "image"])
+        item_type = st.selectbox("Feedback Type", config.FEEDBACK_ITEM_TYPES)
         comment = st.text_area("Your Comment/Feedback", 
                               placeholder="Share your thoughts, concerns, or approval...")
         approval_status = st.radio("Approval Status", 
-                                  ["pending", "approved", "rejected"],
+                                  config.FEEDBACK_STATUSES,
                                   horizontal=True)
         
         submit = st.form_submit_button("Submit Feedback", type="primary")
@@ -410,23 +430,28 @@ def show_client_feedback(project_id):
     # Display previous feedback
     st.subheader("📝 Your Previous Feedback")
     
+    # Fetch one extra row to know whether a further page exists
+    limit = st.session_state.get('feedback_limit', config.FEEDBACK_PAGE_SIZE)
     feedback_items = get_records('feedback', 
                                 'project_id = %s ORDER BY created_at DESC', 
-                                (project_id,))
+                                (project_id,),
+                                columns='item_type, comment, approval_status, created_at',
+                                limit=limit + 1)
+    has_more = len(feedback_items) > limit
+    feedback_items = feedback_items[:limit]
     
     if feedback_items:
         for feedback in feedback_items:
-            status_emoji = {
-                'approved': '✅',
-                'pending': '⏳',
-                'rejected': '❌'
-            }
-            
-            with st.expander(f"{status_emoji[feedback['approval_status']]} {feedback['item_type'].title()} - {format_datetime(feedback['created_at'])}"):
-                st.markdown(f"**Type:** {feedback['item_type'].title()}")
-                st.markdown(f"**Status:** {feedback['approval_status'].title()}")
+            with st.expander(f"{config.FEEDBACK_STATUS_EMOJI[feedback['approval_status']]} {format_label(feedback['item_type'])} - {format_datetime(feedback['created_at'])}"):
+                st.markdown(f"**Type:** {format_label(feedback['item_type'])}")
+                st.markdown(f"**Status:** {format_label(feedback['approval_status'])}")
                 st.markdown(f"**Date:** {format_datetime(feedback['created_at'])}")
                 st.markdown(f"**Your Comment:**")
                 st.info(feedback['comment'])
+        
+        if has_more:
+            if st.button("Load more", key="more_feedback"):
+                st.session_state['feedback_limit'] = limit + config.FEEDBACK_PAGE_SIZE
+                st.rerun()
     else:
         show_info("No feedback submitted yet.")
@@ -4,6 +4,7 @@ Contains database credentials and application settings
 """
 
 import os
+import secrets
 import streamlit as st
 
 # =====================================================
@@ -29,6 +30,19 @@ except Exception as e:
         'port': int(os.getenv('DB_PORT', 3306))
     }
 
+# Print connection settings once when the pool is created (set DB_DEBUG=1)
+DB_DEBUG = bool(os.getenv('DB_DEBUG'))
+
+# Number of pooled MySQL connections kept open per process
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+
+# Seconds to wait for a free pooled connection before giving up
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 5))
+
+# Shortest word the full-text index stores (must match the server's
+# innodb_ft_min_token_size); shorter searches fall back to LIKE
+FULLTEXT_MIN_TOKEN_SIZE = int(os.getenv('FULLTEXT_MIN_TOKEN_SIZE', 3))
+
 # =====================================================
 # FILE STORAGE PATHS
 # =====================================================
@@ -52,17 +66,66 @@ try:
 except Exception:
     # Fallback to environment variables or defaults
     COOKIE_NAME = os.getenv('COOKIE_NAME', 'interior_design_session')
-    COOKIE_KEY = os.getenv('COOKIE_KEY', 'interior_design_secret_key_change_in_production')
+    COOKIE_KEY = os.getenv('COOKIE_KEY')
     COOKIE_EXPIRY_DAYS = int(os.getenv('COOKIE_EXPIRY_DAYS', 30))
 
+if not COOKIE_KEY:
+    # Never sign sessions with a guessable default; a random key is only
+    # valid for this process, so saved logins end when the app restarts
+    print("Warning: No cookie_key configured, using a temporary random key.")
+    COOKIE_KEY = secrets.token_urlsafe(32)
+
+# bcrypt work factor for password hashing (each +1 doubles hashing cost)
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 10))
+
 # =====================================================
 # APPLICATION SETTINGS
 # =====================================================
 APP_TITLE = "Interior Design Project Management System"
 PAGE_ICON = "🏠"
 
+# Status display mappings shared by both dashboards
+TIMELINE_STATUS_EMOJI = {
+    'pending': '⏳',
+    'in_progress': '🔄',
+    'completed': '✅'
+}
+TIMELINE_STATUS_COLOR = {
+    'pending': 'orange',
+    'in_progress': 'blue',
+    'completed': 'green'
+}
+FEEDBACK_STATUS_EMOJI = {
+    'approved': '✅',
+    'pending': '⏳',
+    'rejected': '❌'
+}
+FEEDBACK_STATUS_COLOR = {
+    'approved': 'green',
+    'pending': 'orange',
+    'rejected': 'red'
+}
+
+# Fixed widget option lists (tuples, built once at import)
+SITE_TYPES = ("Residential", "Commercial", "Office", "Restaurant", "Retail", "Other")
+CONTACT_METHODS = ("Email", "Phone", "WhatsApp", "Any")
+SUPPLIER_CATEGORIES = ("Furniture", "Lighting", "Paint", "Flooring",
+                       "Electricals", "Plumbing", "Fabrics", "Accessories", "Other")
+TIMELINE_STATUSES = ('pending', 'in_progress', 'completed')
+TIMELINE_STATUS_INDEX = {status: index for index, status in enumerate(TIMELINE_STATUSES)}
+FEEDBACK_STATUSES = ('pending', 'approved', 'rejected')
+FEEDBACK_ITEM_TYPES = ('drawing', 'image')
+DRAWING_MODES = ("freedraw", "line", "rect", "circle", "transform")
+
+# Page sizes for long lists ("Load more" fetches another page)
+GALLERY_PAGE_SIZE = 24
+FEEDBACK_PAGE_SIZE = 10
+
+# Rows per page for the designer's paged lists (page number selector)
+LIST_PAGE_SIZE = int(os.getenv('LIST_PAGE_SIZE', 25))
+
 # Default task list for new projects
-DEFAULT_TASKS = [
+DEFAULT_TASKS = (
     "Site Survey & Measurements",
     "Conceptual Design",
     "3D Modeling & Visualization",
@@ -76,10 +139,10 @@ DEFAULT_TASKS = [
     "Furniture Installation",
     "Final Styling & Accessories",
     "Quality Check & Handover"
-]
+)
 
 # Default budget categories
-DEFAULT_BUDGET_CATEGORIES = [
+DEFAULT_BUDGET_CATEGORIES = (
     "Design Fees",
     "Furniture",
     "Lighting Fixtures",
@@ -92,7 +155,7 @@ DEFAULT_BUDGET_CATEGORIES = [
     "Carpentry",
     "Decorative Accessories",
     "Contingency Fund"
-]
+)
 
 # =====================================================
 # HELPER FUNCTION TO CREATE UPLOAD DIRECTORIES
@@ -109,3 +172,23 @@ def create_upload_directories():
 # =====================================================
 ALLOWED_IMAGE_EXTENSIONS = ['png', 'jpg', 'jpeg', 'gif', 'webp']
 ALLOWED_DRAWING_EXTENSIONS = ['pdf', 'dwg', 'dxf', 'png', 'jpg', 'jpeg']
+
+# Extensions save_uploaded_file accepts per file type (the uploader's type=
+# filter is only a browser hint); unlisted types are not checked
+UPLOAD_EXTENSIONS = {
+    'reference': ALLOWED_IMAGE_EXTENSIONS,
+    'gallery': ALLOWED_IMAGE_EXTENSIONS,
+    'drawing': ALLOWED_DRAWING_EXTENSIONS
+}
+
+# Bounding box of thumbnails written next to uploaded images
+THUMBNAIL_SIZE = (400, 400)
+
+# Uploads of these types are transcoded to WebP on save
+# (drawings and whiteboard canvases are kept byte-for-byte)
+WEBP_FILE_TYPES = ('gallery', 'reference')
+WEBP_SOURCE_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'webp'})
+WEBP_QUALITY = 80
+
+# Drawing file types that can be previewed inline as images
+PREVIEWABLE_IMAGE_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'gif'})
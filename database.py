@@ -3,32 +3,81 @@ Database Connection Module
 Handles all MySQL database connections and operations
 """
 
+import os
+import re
+import time
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
+from mysql.connector.errors import PoolError
 from contextlib import contextmanager
+from functools import lru_cache
+import streamlit as st
 import config
 
 # =====================================================
 # DATABASE CONNECTION FUNCTIONS
 # =====================================================
 
-def get_db_connection():
+@st.cache_resource
+def get_connection_pool():
     """
-    Establish and return a MySQL database connection
+    Create the MySQL connection pool once per process
+    Connections are reused across reruns and sessions instead of
+    opening a new TCP connection for every query
+    
     Returns:
-        connection object or None if connection fails
+        MySQLConnectionPool object
     """
-    try:
-        print(f"Attempting to connect to database...")
+    if config.DB_DEBUG:
+        print(f"Creating database connection pool...")
         print(f"Host: {config.DB_CONFIG['host']}")
         print(f"User: {config.DB_CONFIG['user']}")
         print(f"Database: {config.DB_CONFIG['database']}")
-        print(f"Password set: {'Yes' if config.DB_CONFIG['password'] else 'No'}")
-        
-        connection = mysql.connector.connect(**config.DB_CONFIG)
-        if connection.is_connected():
-            print("✓ Database connection successful!")
-            return connection
+    
+    return pooling.MySQLConnectionPool(
+        pool_name="interior_design_pool",
+        pool_size=config.DB_POOL_SIZE,
+        # get_cursor() commits on success and rolls back on any exception
+        # before check-in, and no session variables are used, so skip the
+        # reset round trip per query. Connections taken via
+        # get_db_connection() must finish their own transaction the same way
+        pool_reset_session=False,
+        **config.DB_CONFIG
+    )
+
+def checkout_connection():
+    """
+    Check a connection out of the pool, waiting briefly if all are in use
+    The pool reconnects stale connections on checkout, so a database
+    restart only costs a reconnect on the next query
+    
+    Returns:
+        Pooled connection object
+    
+    Raises:
+        mysql.connector.errors.PoolError if no connection frees up within
+        config.DB_POOL_TIMEOUT seconds
+    """
+    pool = get_connection_pool()
+    deadline = time.monotonic() + config.DB_POOL_TIMEOUT
+    while True:
+        try:
+            return pool.get_connection()
+        except PoolError:
+            # Exhausted: concurrent sessions or upload workers hold every slot
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+def get_db_connection():
+    """
+    Get a MySQL database connection from the pool
+    Calling close() on the connection returns it to the pool
+    Returns:
+        connection object or None if connection fails
+    """
+    try:
+        return checkout_connection()
     except Error as e:
         print(f"❌ Database connection error: {e}")
         print(f"Error Code: {e.errno if hasattr(e, 'errno') else 'N/A'}")
@@ -42,7 +91,7 @@ def get_db_connection():
 def get_cursor(dictionary=True):
     """
     Context manager for database operations
-    Automatically handles connection and cursor lifecycle
+    Checks a connection out of the pool and returns it when done
     
     Args:
         dictionary: If True, returns results as dictionaries
@@ -52,11 +101,11 @@ def get_cursor(dictionary=True):
             cursor.execute("SELECT * FROM users")
             results = cursor.fetchall()
     """
-    connection = get_db_connection()
-    if connection is None:
-        yield None
-        return
+    # Raises if the database is unreachable instead of yielding None;
+    # app.main() verifies connectivity before any page queries run
+    connection = checkout_connection()
     
+    cursor = None
     try:
         cursor = connection.cursor(dictionary=dictionary)
         yield cursor
@@ -65,10 +114,33 @@ def get_cursor(dictionary=True):
         connection.rollback()
         print(f"Database error: {e}")
         raise
+    except BaseException:
+        # Any other failure (or st.stop()/st.rerun() inside the block)
+        # must not leave an open transaction on the pooled connection
+        connection.rollback()
+        raise
     finally:
-        if connection.is_connected():
+        if cursor is not None:
             cursor.close()
-            connection.close()
+        # Always hand the connection back, otherwise a dropped connection
+        # would permanently take up a pool slot
+        connection.close()
+
+@contextmanager
+def transaction():
+    """
+    Run several writes on one connection with a single commit
+    Rolls everything back if any statement fails, and clears the read
+    caches once the commit succeeds
+    
+    Usage:
+        with transaction() as cursor:
+            insert_many('tasks', task_rows, cursor=cursor)
+            insert_many('budget_items', budget_rows, cursor=cursor)
+    """
+    with get_cursor() as cursor:
+        yield cursor
+    clear_cached_reads()
 
 # =====================================================
 # DATABASE INITIALIZATION
@@ -98,6 +170,9 @@ def initialize_database():
         print(f"Error creating database: {e}")
         return False
 
+# Matches single-line SQL comments (full-line and trailing)
+SQL_COMMENT_PATTERN = re.compile(r'--[^\n]*')
+
 def execute_schema_file(schema_file_path):
     """
     Execute SQL schema file to create tables
@@ -105,6 +180,10 @@ def execute_schema_file(schema_file_path):
     Args:
         schema_file_path: Path to the SQL schema file
     """
+    # The full schema drops and recreates tables, so forget earlier checks
+    global _tables_verified, _summary_tables_verified, _indexes_verified
+    _tables_verified = _summary_tables_verified = _indexes_verified = False
+    
     try:
         with open(schema_file_path, 'r', encoding='utf-8') as file:
             sql_script = file.read()
@@ -116,17 +195,8 @@ def execute_schema_file(schema_file_path):
         
         cursor = connection.cursor()
         
-        # Remove comments and split by semicolon
-        lines = sql_script.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            # Remove single-line comments
-            if not line.strip().startswith('--'):
-                cleaned_lines.append(line)
-        
-        cleaned_script = '\n'.join(cleaned_lines)
-        
-        # Split by semicolon and execute each statement
+        # Remove all "--" comments in one pass, then split by semicolon
+        cleaned_script = SQL_COMMENT_PATTERN.sub('', sql_script)
         statements = cleaned_script.split(';')
         
         for statement in statements:
@@ -135,7 +205,6 @@ def execute_schema_file(schema_file_path):
             if statement and len(statement) > 5:
                 try:
                     cursor.execute(statement)
-                    connection.commit()
                 except Error as e:
                     error_msg = str(e).lower()
                     # Only skip "already exists" errors
@@ -146,6 +215,8 @@ def execute_schema_file(schema_file_path):
                         connection.close()
                         return False
         
+        # Single commit for the whole script
+        connection.commit()
         cursor.close()
         connection.close()
         print("✓ Database schema executed successfully")
@@ -172,11 +243,11 @@ def execute_query(query, params=None, fetch_one=False, fetch_all=False):
     
     Returns:
         Results or last inserted id
+    
+    Raises:
+        mysql.connector.Error if the database is unreachable or the query fails
     """
     with get_cursor() as cursor:
-        if cursor is None:
-            return None
-        
         cursor.execute(query, params or ())
         
         if fetch_one:
@@ -186,6 +257,76 @@ def execute_query(query, params=None, fetch_one=False, fetch_all=False):
         else:
             return cursor.lastrowid
 
+@lru_cache(maxsize=128)
+def build_insert_query(table, columns):
+    """
+    Build (and memoize) an INSERT statement for a table and column tuple
+    
+    Args:
+        table: Table name
+        columns: Tuple of column names
+    
+    Returns:
+        Parameterized INSERT query string
+    """
+    placeholders = ', '.join(['%s'] * len(columns))
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+@lru_cache(maxsize=128)
+def build_update_query(table, columns, condition):
+    """
+    Build (and memoize) an UPDATE statement for a table, column tuple and WHERE clause
+    
+    Args:
+        table: Table name
+        columns: Tuple of column names to set
+        condition: WHERE clause (e.g., "id = %s")
+    
+    Returns:
+        Parameterized UPDATE query string
+    """
+    set_clause = ', '.join([f"{column} = %s" for column in columns])
+    return f"UPDATE {table} SET {set_clause} WHERE {condition}"
+
+@lru_cache(maxsize=256)
+def build_select_query(table, columns, condition, order_by, with_limit, with_offset):
+    """
+    Build (and memoize) a SELECT statement for get_records
+    
+    Args:
+        table: Table name
+        columns: Columns to select
+        condition: Optional WHERE clause (may end with ORDER BY)
+        order_by: Optional ORDER BY expression
+        with_limit: Append a LIMIT placeholder
+        with_offset: Append an OFFSET placeholder (only used with a limit)
+    
+    Returns:
+        Parameterized SELECT query string
+    """
+    query = f"SELECT {columns} FROM {table}"
+    if condition:
+        query += f" WHERE {condition}"
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    if with_limit:
+        query += " LIMIT %s"
+        if with_offset:
+            query += " OFFSET %s"
+    return query
+
+def escape_like(value):
+    """
+    Escape LIKE wildcards so user input is matched literally
+    
+    Args:
+        value: Text to embed in a LIKE pattern
+    
+    Returns:
+        Text with backslash, % and _ escaped (MySQL's default escape character)
+    """
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
 def insert_record(table, data):
     """
     Insert a record into a table
@@ -197,11 +338,77 @@ def insert_record(table, data):
     Returns:
         Last inserted ID
     """
-    columns = ', '.join(data.keys())
-    placeholders = ', '.join(['%s'] * len(data))
-    query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+    query = build_insert_query(table, tuple(data))
     
-    return execute_query(query, tuple(data.values()))
+    record_id = execute_query(query, tuple(data.values()))
+    clear_cached_reads()
+    return record_id
+
+@lru_cache(maxsize=128)
+def build_upsert_query(table, columns, update_columns):
+    """
+    Build (and memoize) an INSERT ... ON DUPLICATE KEY UPDATE statement
+    
+    Args:
+        table: Table name
+        columns: Tuple of column names to insert
+        update_columns: Tuple of column names to overwrite when the row exists
+    
+    Returns:
+        Parameterized upsert query string
+    """
+    update_clause = ', '.join([f"{column} = VALUES({column})" for column in update_columns])
+    return f"{build_insert_query(table, columns)} ON DUPLICATE KEY UPDATE {update_clause}"
+
+def upsert_record(table, data, update_columns):
+    """
+    Insert a record, or update it if a unique key already matches
+    
+    Args:
+        table: Table name
+        data: Dictionary of column:value pairs (must include the unique key)
+        update_columns: Columns to overwrite on an existing row
+    
+    Returns:
+        Success boolean
+    """
+    query = build_upsert_query(table, tuple(data), tuple(update_columns))
+    
+    execute_query(query, tuple(data.values()))
+    clear_cached_reads()
+    return True
+
+def insert_many(table, rows, cursor=None):
+    """
+    Insert several records into a table in one round trip
+    All rows must have the same keys
+    
+    Args:
+        table: Table name
+        rows: List of dictionaries of column:value pairs
+        cursor: Optional cursor from transaction(); the caller then owns
+                the commit and cache invalidation
+    
+    Returns:
+        Number of inserted rows
+    """
+    if not rows:
+        return 0
+    
+    query = build_insert_query(table, tuple(rows[0]))
+    params = [tuple(row.values()) for row in rows]
+    
+    if cursor is not None:
+        cursor.executemany(query, params)
+        return cursor.rowcount
+    
+    with get_cursor() as cursor:
+        # mysql-connector rewrites this into a single multi-row INSERT
+        cursor.executemany(query, params)
+        inserted = cursor.rowcount
+    
+    clear_cached_reads()
+    return inserted
 
 def update_record(table, data, condition, condition_params):
     """
@@ -216,11 +423,56 @@ def update_record(table, data, condition, condition_params):
     Returns:
         Success boolean
     """
-    set_clause = ', '.join([f"{k} = %s" for k in data.keys()])
-    query = f"UPDATE {table} SET {set_clause} WHERE {condition}"
+    query = build_update_query(table, tuple(data), condition)
     params = tuple(data.values()) + condition_params
     
     execute_query(query, params)
+    clear_cached_reads()
+    return True
+
+@lru_cache(maxsize=128)
+def build_update_many_query(table, key_column, columns, row_count):
+    """
+    Build (and memoize) a multi-row UPDATE that joins the table against
+    a derived table of new values
+    
+    Args:
+        table: Table name
+        key_column: Column used to match rows (e.g., "id")
+        columns: Tuple of column names in parameter order, including key_column
+        row_count: Number of rows being updated
+    
+    Returns:
+        Parameterized UPDATE query string
+    """
+    select_row = "SELECT " + ", ".join([f"%s AS {column}" for column in columns])
+    values_table = " UNION ALL ".join([select_row] * row_count)
+    set_clause = ', '.join([f"t.{column} = v.{column}" for column in columns if column != key_column])
+    return (f"UPDATE {table} t JOIN ({values_table}) v ON t.{key_column} = v.{key_column} "
+            f"SET {set_clause}")
+
+def update_many(table, rows, key_column='id'):
+    """
+    Update several records in a table with a single statement
+    All rows must have the same keys
+    
+    Args:
+        table: Table name
+        rows: List of dictionaries of column:value pairs, each including key_column
+        key_column: Column used to match rows (default: "id")
+    
+    Returns:
+        Success boolean
+    """
+    if not rows:
+        return True
+    
+    columns = tuple(rows[0])
+    query = build_update_many_query(table, key_column, columns, len(rows))
+    params = tuple(row[column] for row in rows for column in columns)
+    
+    execute_query(query, params)
+    clear_cached_reads()
     return True
 
 def delete_record(table, condition, condition_params):
@@ -237,26 +489,295 @@ def delete_record(table, condition, condition_params):
     """
     query = f"DELETE FROM {table} WHERE {condition}"
     execute_query(query, condition_params)
+    clear_cached_reads()
     return True
 
-def get_records(table, condition=None, condition_params=None, columns="*"):
+def get_records(table, condition=None, condition_params=None, columns="*",
+                limit=None, offset=None, order_by=None):
     """
     Fetch records from a table
     
     Args:
         table: Table name
-        condition: Optional WHERE clause
+        condition: Optional WHERE clause (may end with ORDER BY)
         condition_params: Tuple of parameters for WHERE clause
         columns: Columns to select (default: all)
+        limit: Optional maximum number of rows to return
+        offset: Optional number of rows to skip (used with limit)
+        order_by: Optional ORDER BY expression (e.g., "category, name")
     
     Returns:
         List of records
     """
-    query = f"SELECT {columns} FROM {table}"
-    if condition:
-        query += f" WHERE {condition}"
+    params = tuple(condition_params or ())
+    if limit is not None:
+        params += (limit,)
+        if offset:
+            params += (offset,)
+    
+    query = build_select_query(table, columns, condition, order_by,
+                               limit is not None, bool(offset))
+    return execute_query(query, params, fetch_all=True) or []
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_get_records(table, condition=None, condition_params=None, columns="*",
+                       limit=None, offset=None, order_by=None):
+    """
+    Cached version of get_records for read-only lookups on hot paths
+    Results are reused across reruns for up to 60 seconds
+    
+    Args:
+        table: Table name
+        condition: Optional WHERE clause
+        condition_params: Tuple of parameters for WHERE clause (must be hashable)
+        columns: Columns to select (default: all)
+        limit: Optional maximum number of rows to return
+        offset: Optional number of rows to skip (used with limit)
+        order_by: Optional ORDER BY expression
+    
+    Returns:
+        List of records
+    
+    insert_record, update_record and delete_record invalidate this cache;
+    call clear_cached_reads() after any other write
+    """
+    return get_records(table, condition, condition_params, columns, limit, offset, order_by)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_client_project_with_designer(client_id):
+    """
+    Fetch a client's project together with its designer in one query
+    
+    Args:
+        client_id: ID of the client user
+    
+    Returns:
+        Project dictionary with designer_name and designer_email, or None
+    """
+    return execute_query("""
+        SELECT p.*, u.name AS designer_name, u.email AS designer_email
+        FROM projects p
+        JOIN users u ON u.id = p.designer_id
+        WHERE p.client_id = %s
+        LIMIT 1
+    """, (client_id,), fetch_one=True)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_designer_projects(designer_id):
+    """
+    Fetch a designer's projects together with their clients, newest first
+    
+    Args:
+        designer_id: ID of the designer user
     
-    return execute_query(query, condition_params, fetch_all=True) or []
+    Returns:
+        List of project dictionaries with client_name and client_email
+    """
+    return execute_query("""
+        SELECT p.id, p.site_type, p.contact_details, p.preferred_contact, p.created_at,
+               c.name AS client_name, c.email AS client_email
+        FROM projects p
+        JOIN users c ON p.client_id = c.id
+        WHERE p.designer_id = %s
+        ORDER BY p.created_at DESC
+    """, (designer_id,), fetch_all=True) or []
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_designer_clients(designer_id):
+    """
+    Fetch the clients a designer has projects with, newest first
+    
+    Args:
+        designer_id: ID of the designer user
+    
+    Returns:
+        List of client dictionaries with their access codes
+    """
+    return execute_query("""
+        SELECT u.name, u.email, u.client_code, u.created_at
+        FROM users u
+        WHERE u.role = 'client'
+          AND EXISTS (SELECT 1 FROM projects p
+                      WHERE p.client_id = u.id AND p.designer_id = %s)
+        ORDER BY u.created_at DESC
+    """, (designer_id,), fetch_all=True) or []
+
+def clear_cached_reads():
+    """
+    Invalidate all cached read helpers
+    Called automatically by the insert/update/delete helpers
+    """
+    cached_get_records.clear()
+    get_client_project_with_designer.clear()
+    get_designer_projects.clear()
+    get_designer_clients.clear()
+    get_task_summary.clear()
+    get_reference_room_counts.clear()
+    get_measurement_counts.clear()
+
+# =====================================================
+# AGGREGATE QUERIES
+# =====================================================
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_task_summary(project_id):
+    """
+    Compute task progress counts and average completion in SQL
+    
+    Args:
+        project_id: Project ID
+    
+    Returns:
+        Dictionary with total, completed, in_progress, pending and
+        average_progress keys
+    """
+    row = execute_query("""
+        SELECT COUNT(*) AS total,
+               COALESCE(SUM(progress_percent = 100), 0) AS completed,
+               COALESCE(SUM(progress_percent > 0 AND progress_percent < 100), 0) AS in_progress,
+               COALESCE(SUM(progress_percent = 0), 0) AS pending,
+               COALESCE(AVG(progress_percent), 0) AS average_progress
+        FROM tasks
+        WHERE project_id = %s
+    """, (project_id,), fetch_one=True) or {}
+    
+    return {
+        'total': int(row.get('total', 0)),
+        'completed': int(row.get('completed', 0)),
+        'in_progress': int(row.get('in_progress', 0)),
+        'pending': int(row.get('pending', 0)),
+        'average_progress': float(row.get('average_progress', 0))
+    }
+
+def get_timeline_status_counts(project_id):
+    """
+    Read a project's milestone counts per status from timeline_summary
+    (maintained by triggers on timeline, so no aggregate runs here)
+    
+    Args:
+        project_id: Project ID
+    
+    Returns:
+        Dictionary mapping each status to its milestone count
+    """
+    row = execute_query("""
+        SELECT pending, in_progress, completed
+        FROM timeline_summary
+        WHERE project_id = %s
+    """, (project_id,), fetch_one=True) or {}
+    
+    return {status: int(row.get(status, 0)) for status in ('pending', 'in_progress', 'completed')}
+
+def get_feedback_status_counts(project_id):
+    """
+    Read a project's feedback counts per approval status from feedback_summary
+    (maintained by triggers on feedback, so no aggregate runs here)
+    
+    Args:
+        project_id: Project ID
+    
+    Returns:
+        Dictionary mapping each approval status to its feedback count
+    """
+    row = execute_query("""
+        SELECT approved, pending, rejected
+        FROM feedback_summary
+        WHERE project_id = %s
+    """, (project_id,), fetch_one=True) or {}
+    
+    return {status: int(row.get(status, 0)) for status in ('approved', 'pending', 'rejected')}
+
+def get_gallery_counts(project_id):
+    """
+    Count gallery images per uploader in SQL
+    
+    Args:
+        project_id: Project ID
+    
+    Returns:
+        Dictionary with 'client' and 'designer' image counts
+    """
+    rows = execute_query("""
+        SELECT uploaded_by, COUNT(*) AS count
+        FROM gallery
+        WHERE project_id = %s
+        GROUP BY uploaded_by
+    """, (project_id,), fetch_all=True) or []
+    
+    counts = {'client': 0, 'designer': 0}
+    for row in rows:
+        counts[row['uploaded_by']] = int(row['count'])
+    return counts
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_reference_room_counts(project_id):
+    """
+    Count reference images per room in SQL
+    
+    Args:
+        project_id: Project ID
+    
+    Returns:
+        List of dictionaries with room_name and image_count, sorted by room
+    """
+    return execute_query("""
+        SELECT room_name, COUNT(*) AS image_count
+        FROM reference_library
+        WHERE project_id = %s
+        GROUP BY room_name
+        ORDER BY room_name
+    """, (project_id,), fetch_all=True) or []
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_measurement_counts(project_id):
+    """
+    Count a project's drawings per type in SQL
+    
+    Args:
+        project_id: Project ID
+    
+    Returns:
+        Dictionary with 'existing' and 'proposed' drawing counts
+    """
+    rows = execute_query("""
+        SELECT type, COUNT(*) AS count
+        FROM measurements
+        WHERE project_id = %s
+        GROUP BY type
+    """, (project_id,), fetch_all=True) or []
+    
+    counts = {'existing': 0, 'proposed': 0}
+    for row in rows:
+        counts[row['type']] = int(row['count'])
+    return counts
+
+def get_budget_totals(project_id):
+    """
+    Sum estimated and actual budget costs in SQL
+    
+    Args:
+        project_id: Project ID
+    
+    Returns:
+        Dictionary with the same keys as utils.calculate_budget_statistics
+    """
+    row = execute_query("""
+        SELECT COALESCE(SUM(estimated_cost), 0) AS total_estimated,
+               COALESCE(SUM(actual_cost), 0) AS total_actual
+        FROM budget_items
+        WHERE project_id = %s
+    """, (project_id,), fetch_one=True) or {}
+    
+    total_estimated = float(row.get('total_estimated', 0))
+    total_actual = float(row.get('total_actual', 0))
+    difference = total_actual - total_estimated
+    
+    return {
+        'total_estimated': total_estimated,
+        'total_actual': total_actual,
+        'difference': difference,
+        'over_budget': difference > 0
+    }
 
 # =====================================================
 # TEST CONNECTION FUNCTION
@@ -276,38 +797,207 @@ def test_connection():
         print("✗ Database connection failed!")
         return False
 
+# Tables the application expects to find in the database
+REQUIRED_TABLES = (
+    'users', 'projects', 'reference_library', 'tasks',
+    'notes_whiteboard', 'budget_items', 'suppliers',
+    'measurements', 'gallery', 'timeline', 'feedback'
+)
+
+# Derived count tables; created in place by ensure_summary_tables() so an
+# older database is upgraded without re-running the destructive schema
+SUMMARY_TABLES = ('timeline_summary', 'feedback_summary')
+SUMMARY_TRIGGERS = tuple(f"{table}_{event}" for table in SUMMARY_TABLES
+                         for event in ('insert', 'update', 'delete'))
+SUMMARY_SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database_summary_tables.sql')
+
+# Set once the schema has been verified; reset by execute_schema_file()
+_tables_verified = False
+_summary_tables_verified = False
+_indexes_verified = False
+
+# Indexes added after the first release, with the statement that adds each
+# one to an older database (new installs get them from database_schema.sql)
+UPGRADE_INDEXES = {
+    ('users', 'idx_email_role'):
+        'ALTER TABLE users ADD INDEX idx_email_role (email, role)',
+    ('projects', 'idx_client_designer'):
+        'ALTER TABLE projects ADD INDEX idx_client_designer (client_id, designer_id)',
+    ('projects', 'idx_designer_created'):
+        'ALTER TABLE projects ADD INDEX idx_designer_created (designer_id, created_at)',
+    ('reference_library', 'idx_project_room'):
+        'ALTER TABLE reference_library ADD INDEX idx_project_room (project_id, room_name)',
+    ('suppliers', 'idx_category_name'):
+        'ALTER TABLE suppliers ADD INDEX idx_category_name (category, name)',
+    ('suppliers', 'idx_name'):
+        'ALTER TABLE suppliers ADD INDEX idx_name (name)',
+    ('suppliers', 'ft_suppliers'):
+        'ALTER TABLE suppliers ADD FULLTEXT INDEX ft_suppliers (name, category, phone, email)',
+    ('measurements', 'idx_project_type_uploaded'):
+        'ALTER TABLE measurements ADD INDEX idx_project_type_uploaded (project_id, type, uploaded_at)',
+    ('gallery', 'idx_project_uploader'):
+        'ALTER TABLE gallery ADD INDEX idx_project_uploader (project_id, uploaded_by, uploaded_at)',
+    ('timeline', 'idx_project_deadline'):
+        'ALTER TABLE timeline ADD INDEX idx_project_deadline (project_id, deadline)',
+    ('feedback', 'idx_project_created'):
+        'ALTER TABLE feedback ADD INDEX idx_project_created (project_id, created_at)',
+}
+
+# Upgrade indexes that could not be created; queries needing them fall back
+_missing_indexes = set()
+
+def get_missing_tables(tables):
+    """
+    Find which of the given tables are absent from the database
+    
+    Args:
+        tables: Tuple of table names
+    
+    Returns:
+        List of missing table names
+    
+    Raises:
+        mysql.connector.Error if the database is unreachable or the query fails
+    """
+    placeholders = ', '.join(['%s'] * len(tables))
+    rows = execute_query(f"""
+        SELECT table_name AS name
+        FROM information_schema.tables
+        WHERE table_schema = %s AND table_name IN ({placeholders})
+    """, (config.DB_CONFIG['database'],) + tuple(tables), fetch_all=True)
+    
+    existing_tables = {row['name'] for row in rows}
+    return [table for table in tables if table not in existing_tables]
+
+def get_missing_triggers(triggers):
+    """
+    Find which of the given triggers are absent from the database
+    
+    Args:
+        triggers: Tuple of trigger names
+    
+    Returns:
+        List of missing trigger names
+    
+    Raises:
+        mysql.connector.Error if the database is unreachable or the query fails
+    """
+    placeholders = ', '.join(['%s'] * len(triggers))
+    rows = execute_query(f"""
+        SELECT trigger_name AS name
+        FROM information_schema.triggers
+        WHERE trigger_schema = %s AND trigger_name IN ({placeholders})
+    """, (config.DB_CONFIG['database'],) + tuple(triggers), fetch_all=True)
+    
+    existing_triggers = {row['name'] for row in rows}
+    return [trigger for trigger in triggers if trigger not in existing_triggers]
+
 def check_tables_exist():
     """
     Check if all required tables exist in the database
-    Returns True if all tables exist, False otherwise
+    The result is remembered for the process after the first success
+    Returns True if all tables exist, False if any are missing
+    
+    Raises:
+        mysql.connector.Error if the lookup fails, so callers never mistake
+        an unreachable database for an empty one
+    """
+    global _tables_verified
+    if _tables_verified:
+        return True
+    
+    missing_tables = get_missing_tables(REQUIRED_TABLES)
+    
+    if missing_tables:
+        print(f"Missing tables: {', '.join(missing_tables)}")
+        return False
+    
+    print("✓ All required tables exist!")
+    _tables_verified = True
+    return True
+
+def ensure_summary_tables():
     """
-    required_tables = [
-        'users', 'projects', 'reference_library', 'tasks',
-        'notes_whiteboard', 'budget_items', 'suppliers',
-        'measurements', 'gallery', 'timeline', 'feedback'
-    ]
+    Create the summary tables, their triggers and initial counts if missing
+    Only adds objects and recomputes counts, so it is safe on a database
+    that already holds data
+    
+    Returns:
+        True if the tables and all their triggers are in place, False otherwise
+    """
+    global _summary_tables_verified
+    if _summary_tables_verified:
+        return True
     
     try:
-        connection = get_db_connection()
-        if not connection:
-            return False
-        
-        cursor = connection.cursor()
-        cursor.execute("SHOW TABLES")
-        existing_tables = [table[0] for table in cursor.fetchall()]
-        
-        cursor.close()
-        connection.close()
-        
-        # Check if all required tables exist
-        missing_tables = [table for table in required_tables if table not in existing_tables]
-        
-        if missing_tables:
-            print(f"Missing tables: {', '.join(missing_tables)}")
-            return False
+        # Tables without triggers would let the counts drift silently
+        missing = get_missing_tables(SUMMARY_TABLES) + get_missing_triggers(SUMMARY_TRIGGERS)
+        if missing:
+            print(f"Creating summary objects: {', '.join(missing)}")
+            execute_schema_file(SUMMARY_SCHEMA_PATH)
+            
+            # Re-check: a partial run or a refused CREATE TRIGGER (no TRIGGER
+            # privilege, binary logging) leaves objects missing
+            missing = get_missing_tables(SUMMARY_TABLES) + get_missing_triggers(SUMMARY_TRIGGERS)
+            if missing:
+                print(f"Summary objects still missing: {', '.join(missing)}")
+                return False
         
-        print("✓ All required tables exist!")
+        _summary_tables_verified = True
         return True
     except Exception as e:
-        print(f"Error checking tables: {e}")
+        print(f"Error creating summary tables: {e}")
+        return False
+
+def ensure_indexes():
+    """
+    Add any UPGRADE_INDEXES missing from an older database
+    Each index is created on its own, so one failure does not block the rest
+    
+    Returns:
+        True if every upgrade index is in place, False otherwise
+    """
+    global _indexes_verified
+    if _indexes_verified:
+        return True
+    
+    try:
+        tables = tuple({table for table, _ in UPGRADE_INDEXES})
+        placeholders = ', '.join(['%s'] * len(tables))
+        rows = execute_query(f"""
+            SELECT DISTINCT table_name AS table_name, index_name AS index_name
+            FROM information_schema.statistics
+            WHERE table_schema = %s AND table_name IN ({placeholders})
+        """, (config.DB_CONFIG['database'],) + tables, fetch_all=True)
+    except Error as e:
+        print(f"Error checking indexes: {e}")
+        return False
+    
+    existing = {(row['table_name'], row['index_name']) for row in rows}
+    _missing_indexes.clear()
+    for index, statement in UPGRADE_INDEXES.items():
+        if index in existing:
+            continue
+        try:
+            print(f"Creating index: {index[1]} on {index[0]}")
+            execute_query(statement)
+        except Error:
+            _missing_indexes.add(index)
+    
+    if _missing_indexes:
         return False
+    _indexes_verified = True
+    return True
+
+def has_index(table, index_name):
+    """
+    Check whether an upgrade index is usable
+    
+    Args:
+        table: Table name
+        index_name: Index name from UPGRADE_INDEXES
+    
+    Returns:
+        False only if ensure_indexes() failed to create the index
+    """
+    return (table, index_name) not in _missing_indexes
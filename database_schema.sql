@@ -4,6 +4,8 @@
 -- =====================================================
 
 -- Drop existing tables if they exist (for clean setup)
+DROP TABLE IF EXISTS feedback_summary;
+DROP TABLE IF EXISTS timeline_summary;
 DROP TABLE IF EXISTS feedback;
 DROP TABLE IF EXISTS timeline;
 DROP TABLE IF EXISTS gallery;
@@ -28,7 +30,7 @@ CREATE TABLE users (
     role ENUM('designer', 'client') NOT NULL,
     client_code VARCHAR(20) UNIQUE,  -- 8-character code for clients, NULL for designers
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    INDEX idx_email (email),
+    INDEX idx_email_role (email, role),  -- login lookups filter on email + role
     INDEX idx_client_code (client_code)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
@@ -47,8 +49,8 @@ CREATE TABLE projects (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (client_id) REFERENCES users(id) ON DELETE CASCADE,
     FOREIGN KEY (designer_id) REFERENCES users(id) ON DELETE CASCADE,
-    INDEX idx_client (client_id),
-    INDEX idx_designer (designer_id)
+    INDEX idx_client_designer (client_id, designer_id),  -- client lookups and the client-codes EXISTS probe
+    INDEX idx_designer_created (designer_id, created_at)  -- designer project list, newest first
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- =====================================================
@@ -62,7 +64,7 @@ CREATE TABLE reference_library (
     file_path VARCHAR(500) NOT NULL,  -- Path to uploaded image
     uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-    INDEX idx_project (project_id)
+    INDEX idx_project_room (project_id, room_name)  -- also serves project_id lookups
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- =====================================================
@@ -95,7 +97,7 @@ CREATE TABLE notes_whiteboard (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-    INDEX idx_project (project_id)
+    UNIQUE KEY uq_project (project_id)  -- one note/drawing row per project (enables upserts)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- =====================================================
@@ -126,7 +128,9 @@ CREATE TABLE suppliers (
     email VARCHAR(255),
     address TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    INDEX idx_category (category)
+    INDEX idx_category_name (category, name),  -- supplier list, grouped by category
+    INDEX idx_name (name),  -- prefix searches too short for the full-text index
+    FULLTEXT INDEX ft_suppliers (name, category, phone, email)  -- supplier search box
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- =====================================================
@@ -141,7 +145,7 @@ CREATE TABLE measurements (
     file_path VARCHAR(500),  -- Path to CAD/drawing file
     uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-    INDEX idx_project (project_id)
+    INDEX idx_project_type_uploaded (project_id, type, uploaded_at)  -- per-tab drawing lists, newest first
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- =====================================================
@@ -155,7 +159,7 @@ CREATE TABLE gallery (
     file_path VARCHAR(500) NOT NULL,
     uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-    INDEX idx_project (project_id)
+    INDEX idx_project_uploader (project_id, uploaded_by, uploaded_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- =====================================================
@@ -171,7 +175,7 @@ CREATE TABLE timeline (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-    INDEX idx_project (project_id)
+    INDEX idx_project_deadline (project_id, deadline)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- =====================================================
@@ -187,9 +191,16 @@ CREATE TABLE feedback (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-    INDEX idx_project (project_id)
+    INDEX idx_project_created (project_id, created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- =====================================================
+-- SUMMARY TABLES
+-- timeline_summary and feedback_summary (with their triggers) live in
+-- database_summary_tables.sql; the app applies that file on startup
+-- whenever they are missing, without touching the tables above
+-- =====================================================
+
 -- =====================================================
 -- Sample data for testing (OPTIONAL - Comment out in production)
 -- =====================================================
@@ -199,6 +210,30 @@ CREATE TABLE feedback (
 -- INSERT INTO users (name, email, password_hash, role) 
 -- VALUES ('Jane Designer', 'designer@example.com', 'hashed_password_here', 'designer');
 
+-- =====================================================
+-- Upgrading an existing database (run manually once)
+-- =====================================================
+
+-- New indexes are added automatically on startup (database.UPGRADE_INDEXES):
+-- idx_email_role, idx_client_designer, idx_designer_created, idx_project_room,
+-- idx_category_name, idx_name, ft_suppliers, idx_project_type_uploaded,
+-- idx_project_uploader, idx_project_deadline, idx_project_created
+
+-- Optional, once they exist: drop the indexes they supersede
+-- ALTER TABLE users DROP INDEX idx_email;
+-- ALTER TABLE projects DROP INDEX idx_client, DROP INDEX idx_designer;
+-- ALTER TABLE reference_library DROP INDEX idx_project;
+-- ALTER TABLE suppliers DROP INDEX idx_category;
+-- ALTER TABLE measurements DROP INDEX idx_project;
+-- ALTER TABLE gallery DROP INDEX idx_project;
+-- ALTER TABLE timeline DROP INDEX idx_project;
+-- ALTER TABLE feedback DROP INDEX idx_project;
+
+-- Notes are upserted on project_id: keep the first row per project (the one
+-- the app has always read and updated), then add the unique key
+-- DELETE n1 FROM notes_whiteboard n1 JOIN notes_whiteboard n2 ON n1.project_id = n2.project_id AND n1.id > n2.id;
+-- ALTER TABLE notes_whiteboard ADD UNIQUE KEY uq_project (project_id), DROP INDEX idx_project;
+
 -- =====================================================
 -- END OF SCHEMA
 -- =====================================================
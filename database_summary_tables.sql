@@ -0,0 +1,104 @@
+-- =====================================================
+-- INTERIOR DESIGN PROJECT MANAGEMENT SYSTEM
+-- Summary tables for timeline and feedback status counts
+-- =====================================================
+-- Applied automatically on startup when the summary tables are missing
+-- (database.ensure_summary_tables). Every statement only adds objects or
+-- recomputes counts, so it is safe to run on a database with live data.
+-- Trigger bodies are single statements: the file is split on ";"
+
+-- =====================================================
+-- TIMELINE SUMMARY TABLE
+-- Milestone counts per status, kept current by triggers
+-- =====================================================
+CREATE TABLE IF NOT EXISTS timeline_summary (
+    project_id INT PRIMARY KEY,
+    pending INT NOT NULL DEFAULT 0,
+    in_progress INT NOT NULL DEFAULT 0,
+    completed INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+DROP TRIGGER IF EXISTS timeline_summary_insert;
+DROP TRIGGER IF EXISTS timeline_summary_update;
+DROP TRIGGER IF EXISTS timeline_summary_delete;
+
+CREATE TRIGGER timeline_summary_insert AFTER INSERT ON timeline FOR EACH ROW
+    INSERT INTO timeline_summary (project_id, pending, in_progress, completed)
+    VALUES (NEW.project_id, NEW.status = 'pending', NEW.status = 'in_progress', NEW.status = 'completed')
+    ON DUPLICATE KEY UPDATE pending = pending + VALUES(pending),
+                            in_progress = in_progress + VALUES(in_progress),
+                            completed = completed + VALUES(completed);
+
+CREATE TRIGGER timeline_summary_update AFTER UPDATE ON timeline FOR EACH ROW
+    UPDATE timeline_summary
+    SET pending = pending - (OLD.status = 'pending') + (NEW.status = 'pending'),
+        in_progress = in_progress - (OLD.status = 'in_progress') + (NEW.status = 'in_progress'),
+        completed = completed - (OLD.status = 'completed') + (NEW.status = 'completed')
+    WHERE project_id = NEW.project_id;
+
+CREATE TRIGGER timeline_summary_delete AFTER DELETE ON timeline FOR EACH ROW
+    UPDATE timeline_summary
+    SET pending = pending - (OLD.status = 'pending'),
+        in_progress = in_progress - (OLD.status = 'in_progress'),
+        completed = completed - (OLD.status = 'completed')
+    WHERE project_id = OLD.project_id;
+
+-- Backfill from existing milestones (recomputes, so re-running is harmless)
+INSERT INTO timeline_summary (project_id, pending, in_progress, completed)
+    SELECT project_id, SUM(status = 'pending'), SUM(status = 'in_progress'), SUM(status = 'completed')
+    FROM timeline GROUP BY project_id
+    ON DUPLICATE KEY UPDATE pending = VALUES(pending),
+                            in_progress = VALUES(in_progress),
+                            completed = VALUES(completed);
+
+-- =====================================================
+-- FEEDBACK SUMMARY TABLE
+-- Feedback counts per approval status, kept current by triggers
+-- =====================================================
+CREATE TABLE IF NOT EXISTS feedback_summary (
+    project_id INT PRIMARY KEY,
+    approved INT NOT NULL DEFAULT 0,
+    pending INT NOT NULL DEFAULT 0,
+    rejected INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+DROP TRIGGER IF EXISTS feedback_summary_insert;
+DROP TRIGGER IF EXISTS feedback_summary_update;
+DROP TRIGGER IF EXISTS feedback_summary_delete;
+
+CREATE TRIGGER feedback_summary_insert AFTER INSERT ON feedback FOR EACH ROW
+    INSERT INTO feedback_summary (project_id, approved, pending, rejected)
+    VALUES (NEW.project_id, NEW.approval_status = 'approved', NEW.approval_status = 'pending',
+            NEW.approval_status = 'rejected')
+    ON DUPLICATE KEY UPDATE approved = approved + VALUES(approved),
+                            pending = pending + VALUES(pending),
+                            rejected = rejected + VALUES(rejected);
+
+CREATE TRIGGER feedback_summary_update AFTER UPDATE ON feedback FOR EACH ROW
+    UPDATE feedback_summary
+    SET approved = approved - (OLD.approval_status = 'approved') + (NEW.approval_status = 'approved'),
+        pending = pending - (OLD.approval_status = 'pending') + (NEW.approval_status = 'pending'),
+        rejected = rejected - (OLD.approval_status = 'rejected') + (NEW.approval_status = 'rejected')
+    WHERE project_id = NEW.project_id;
+
+CREATE TRIGGER feedback_summary_delete AFTER DELETE ON feedback FOR EACH ROW
+    UPDATE feedback_summary
+    SET approved = approved - (OLD.approval_status = 'approved'),
+        pending = pending - (OLD.approval_status = 'pending'),
+        rejected = rejected - (OLD.approval_status = 'rejected')
+    WHERE project_id = OLD.project_id;
+
+-- Backfill from existing feedback (recomputes, so re-running is harmless)
+INSERT INTO feedback_summary (project_id, approved, pending, rejected)
+    SELECT project_id, SUM(approval_status = 'approved'), SUM(approval_status = 'pending'),
+           SUM(approval_status = 'rejected')
+    FROM feedback GROUP BY project_id
+    ON DUPLICATE KEY UPDATE approved = VALUES(approved),
+                            pending = VALUES(pending),
+                            rejected = VALUES(rejected);
+
+-- =====================================================
+-- END OF SUMMARY TABLES
+-- =====================================================
@@ -3,16 +3,37 @@ Designer Dashboard Module
 Contains all functionality for the interior designer's dashboard
 """
 
+import csv
+import io
+import os
+import re
+import numpy as np
+import pandas as pd
 import streamlit as st
-from database import insert_record, get_records, update_record, delete_record, execute_query
+from PIL import Image
+from database import (
+    insert_record, insert_many, cached_get_records, get_designer_projects, get_designer_clients,
+    get_task_summary, get_timeline_status_counts, get_feedback_status_counts, update_record,
+    update_many, upsert_record, delete_record, transaction, escape_like, has_index,
+    get_reference_room_counts, get_measurement_counts
+)
 from auth import register_client, get_current_user_id
 from utils import (
-    save_uploaded_file, display_image, format_currency, format_date, format_datetime,
-    show_success, show_error, show_info, show_warning, create_project_directories,
-    is_valid_file_extension, calculate_budget_statistics, calculate_task_completion
+    save_uploaded_file, save_uploaded_files, save_image, display_image, format_currency, format_date,
+    format_datetime, format_label, show_success, show_error, show_info, show_warning, show_page_selector,
+    create_project_directories, calculate_budget_statistics
 )
 import config
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from itertools import groupby
+from operator import itemgetter
+
+# Optional dependency for the whiteboard canvas, resolved once at import
+try:
+    from streamlit_drawable_canvas import st_canvas
+except ImportError:
+    st_canvas = None
 
 # =====================================================
 # 1. PROJECT MANAGEMENT
@@ -41,13 +62,7 @@ def show_project_management():
 
 def show_existing_projects_tab(designer_id):
     """Display existing projects in a tab"""
-    projects = execute_query("""
-        SELECT p.*, c.name as client_name, c.email as client_email 
-        FROM projects p 
-        JOIN users c ON p.client_id = c.id 
-        WHERE p.designer_id = %s 
-        ORDER BY p.created_at DESC
-    """, (designer_id,), fetch_all=True)
+    projects = get_designer_projects(designer_id)
     
     if projects:
         st.subheader("Your Projects")
@@ -63,31 +78,49 @@ def show_existing_projects_tab(designer_id):
                     st.write(f"**Contact Details:** {project['contact_details']}")
                     st.write(f"**Preferred Contact:** {project['preferred_contact']}")
                 
-                # Set as active project button
-                if st.button(f"Select This Project", key=f"select_{project['id']}"):
-                    st.session_state['active_project_id'] = project['id']
-                    st.session_state['active_project_name'] = project['client_name']
+                # Set as active project button; the callback runs before the next
+                # script run, so the sidebar is already up to date without st.rerun()
+                if st.button(f"Select This Project", key=f"select_{project['id']}",
+                             on_click=select_project, args=(project,)):
                     show_success(f"Project '{project['client_name']}' selected!")
-                    st.rerun()
     else:
         show_info("No projects yet. Create your first project in the 'Create New' tab!")
 
+def select_project(project):
+    """
+    Make a project the active one (button callback)
+    
+    Args:
+        project: Project row from get_designer_projects
+    """
+    # One structured entry built from the row already loaded
+    st.session_state['active_project'] = {
+        'id': project['id'],
+        'name': project['client_name'],
+        'email': project['client_email'],
+        'site_type': project['site_type']
+    }
+
 def show_client_codes_tab(designer_id):
     """Display all clients with their access codes"""
     st.subheader("👥 Client Access Codes")
     st.caption("View login credentials for all your clients")
     
     # Get all clients for this designer
-    clients = execute_query("""
-        SELECT DISTINCT u.id, u.name, u.email, u.client_code, u.created_at
-        FROM users u
-        JOIN projects p ON u.id = p.client_id
-        WHERE p.designer_id = %s AND u.role = 'client'
-        ORDER BY u.created_at DESC
-    """, (designer_id,), fetch_all=True)
+    clients = get_designer_clients(designer_id)
     
     if clients:
         st.success(f"**Total Clients:** {len(clients)}")
+        
+        # The login steps are the same for every client, so render them once
+        st.info("""
+**📋 Share each client's credentials below with them:**
+
+1. Go to the login page
+2. Click the **"Client"** tab
+3. Enter their **Email** and **Access Code**
+4. Click Login
+        """)
         st.markdown("---")
         
         for client in clients:
@@ -103,19 +136,6 @@ def show_client_codes_tab(designer_id):
                     st.code(client['client_code'], language=None)
                 
                 st.caption(f"Created: {format_datetime(client['created_at'])}")
-                
-                # Instructions
-                st.markdown("---")
-                st.info(f"""
-**📋 Share these credentials with {client['name']}:**
-
-1. Go to the login page
-2. Click the **"Client"** tab
-3. Enter:
-   - **Email:** `{client['email']}`
-   - **Access Code:** `{client['client_code']}`
-4. Click Login
-                """)
     else:
         show_info("No clients yet. Create your first client in the 'Create New' tab!")
 
@@ -129,14 +149,12 @@ def show_create_new_tab(designer_id):
         with col1:
             client_name = st.text_input("Client Name*", placeholder="John Doe")
             client_email = st.text_input("Client Email*", placeholder="client@example.com")
-            site_type = st.selectbox("Site Type*", 
-                                    ["Residential", "Commercial", "Office", "Restaurant", "Retail", "Other"])
+            site_type = st.selectbox("Site Type*", config.SITE_TYPES)
         
         with col2:
             contact_details = st.text_area("Contact Details", 
                                           placeholder="Phone: +91 XXXXXXXXXX\nAddress: ...")
-            preferred_contact = st.selectbox("Preferred Contact Method", 
-                                            ["Email", "Phone", "WhatsApp", "Any"])
+            preferred_contact = st.selectbox("Preferred Contact Method", config.CONTACT_METHODS)
         
         submit = st.form_submit_button("Create Client & Project", type="primary")
         
@@ -145,13 +163,9 @@ def show_create_new_tab(designer_id):
                 show_error("Please fill in all required fields marked with *")
             else:
                 # Create client account
-                success, message, client_code = register_client(client_name, client_email, designer_id)
+                success, message, client_code, client_id = register_client(client_name, client_email, designer_id)
                 
                 if success:
-                    # Get the newly created client's ID
-                    client = get_records('users', 'email = %s', (client_email,))
-                    client_id = client[0]['id']
-                    
                     # Create project
                     project_data = {
                         'client_id': client_id,
@@ -162,14 +176,16 @@ def show_create_new_tab(designer_id):
                     }
                     project_id = insert_record('projects', project_data)
                     
-                    # Create project directories
-                    create_project_directories(project_id)
-                    
-                    # Initialize default tasks
-                    initialize_default_tasks(project_id)
-                    
-                    # Initialize default budget items
-                    initialize_default_budget(project_id)
+                    # Create project directories on a worker while the defaults are inserted
+                    with ThreadPoolExecutor(max_workers=1) as executor:
+                        directories = executor.submit(create_project_directories, project_id)
+                        
+                        # Default tasks and budget items share one transaction
+                        with transaction() as cursor:
+                            initialize_default_tasks(project_id, cursor)
+                            initialize_default_budget(project_id, cursor)
+                        
+                        directories.result()
                     
                     show_success(f"✓ Client and project created successfully!")
                     
@@ -192,28 +208,26 @@ def show_create_new_tab(designer_id):
                 else:
                     show_error(message)
 
-def initialize_default_tasks(project_id):
-    """Initialize default task list for a new project"""
-    for task_title in config.DEFAULT_TASKS:
-        task_data = {
-            'project_id': project_id,
-            'title': task_title,
-            'description': '',
-            'progress_percent': 0,
-            'comments': ''
-        }
-        insert_record('tasks', task_data)
+# Column values shared by every default row; only project_id and the name vary
+DEFAULT_TASK_ROW = {'description': '', 'progress_percent': 0, 'comments': ''}
+DEFAULT_BUDGET_ROW = {'estimated_cost': 0, 'actual_cost': 0}
 
-def initialize_default_budget(project_id):
-    """Initialize default budget categories for a new project"""
-    for category in config.DEFAULT_BUDGET_CATEGORIES:
-        budget_data = {
-            'project_id': project_id,
-            'item_name': category,
-            'estimated_cost': 0,
-            'actual_cost': 0
-        }
-        insert_record('budget_items', budget_data)
+def initialize_default_tasks(project_id, cursor=None):
+    """Initialize default task list for a new project (optionally inside a transaction)"""
+    # One multi-row INSERT instead of a round trip per task
+    task_rows = [
+        {'project_id': project_id, 'title': task_title, **DEFAULT_TASK_ROW}
+        for task_title in config.DEFAULT_TASKS
+    ]
+    insert_many('tasks', task_rows, cursor=cursor)
+
+def initialize_default_budget(project_id, cursor=None):
+    """Initialize default budget categories for a new project (optionally inside a transaction)"""
+    budget_rows = [
+        {'project_id': project_id, 'item_name': category, **DEFAULT_BUDGET_ROW}
+        for category in config.DEFAULT_BUDGET_CATEGORIES
+    ]
+    insert_many('budget_items', budget_rows, cursor=cursor)
 
 # =====================================================
 # 2. REFERENCE LIBRARY
@@ -226,12 +240,13 @@ def show_reference_library():
     """
     st.header("📚 Reference Library")
     
-    project_id = st.session_state.get('active_project_id')
-    if not project_id:
+    project = st.session_state.get('active_project')
+    if not project:
         show_warning("Please select a project from Project Management first")
         return
     
-    st.subheader(f"Project: {st.session_state.get('active_project_name', 'N/A')}")
+    project_id = project['id']
+    st.subheader(f"Project: {project['name']}")
     
     # Upload new reference images
     st.subheader("📤 Upload Reference Images")
@@ -242,51 +257,56 @@ def show_reference_library():
             "Choose images", 
             type=config.ALLOWED_IMAGE_EXTENSIONS,
             accept_multiple_files=True,
-            key="ref_library_upload"
+            key=f"ref_library_upload_{project_id}"
         )
     with col2:
-        room_name = st.text_input("Room Name", placeholder="Living Room")
+        room_name = st.text_input("Room Name", placeholder="Living Room", key=f"ref_room_name_{project_id}")
     
     if st.button("Upload Images", type="primary") and uploaded_files:
         if not room_name:
             show_error("Please enter a room name")
         else:
-            for uploaded_file in uploaded_files:
-                file_path = save_uploaded_file(uploaded_file, project_id, 'reference')
-                if file_path:
-                    ref_data = {
-                        'project_id': project_id,
-                        'room_name': room_name,
-                        'file_path': file_path
-                    }
-                    insert_record('reference_library', ref_data)
-            show_success(f"{len(uploaded_files)} image(s) uploaded successfully!")
-            st.rerun()
+            # Write files concurrently, then insert all rows in one statement
+            file_paths, errors = save_uploaded_files(uploaded_files, project_id, 'reference')
+            
+            ref_rows = [
+                {'project_id': project_id, 'room_name': room_name, 'file_path': file_path}
+                for file_path in file_paths
+            ]
+            insert_many('reference_library', ref_rows)
+            
+            if errors:
+                # Worker threads can't render errors, so report them here
+                show_error(f"{len(errors)} image(s) could not be saved: {'; '.join(errors)}")
+            if ref_rows:
+                show_success(f"{len(ref_rows)} image(s) uploaded successfully!")
+                st.rerun()
     
     st.divider()
     
     # Display existing references organized by room
     st.subheader("🖼️ Existing References")
     
-    references = get_records('reference_library', 'project_id = %s', (project_id,))
+    # Titles only need per-room counts; image rows are fetched per opened room
+    rooms = get_reference_room_counts(project_id)
     
-    if references:
-        # Group by room
-        rooms = {}
-        for ref in references:
-            room = ref['room_name']
-            if room not in rooms:
-                rooms[room] = []
-            rooms[room].append(ref)
-        
-        # Display by room
-        for room, images in rooms.items():
-            with st.expander(f"🏠 {room} ({len(images)} images)"):
+    if rooms:
+        for room in rooms:
+            room_title = room['room_name']
+            with st.expander(f"🏠 {room_title} ({room['image_count']} images)"):
+                # Expander bodies always run, so a toggle keeps closed rooms from loading images
+                if not st.toggle("Show images", key=f"show_ref_room_{project_id}_{room_title}"):
+                    continue
+                
+                images = cached_get_records('reference_library',
+                                            'project_id = %s AND room_name = %s ORDER BY id',
+                                            (project_id, room_title),
+                                            columns='id, file_path')
                 cols = st.columns(3)
                 for idx, img in enumerate(images):
                     with cols[idx % 3]:
                         display_image(img['file_path'], width=200)
-                        if st.button("🗑️ Delete", key=f"del_ref_{img['id']}"):
+                        if st.button("🗑️ Delete", key=f"del_ref_{project_id}_{img['id']}"):
                             delete_record('reference_library', 'id = %s', (img['id'],))
                             show_success("Image deleted")
                             st.rerun()
@@ -304,12 +324,13 @@ def show_task_tracking():
     """
     st.header("✅ Task Tracking")
     
-    project_id = st.session_state.get('active_project_id')
-    if not project_id:
+    project = st.session_state.get('active_project')
+    if not project:
         show_warning("Please select a project from Project Management first")
         return
     
-    st.subheader(f"Project: {st.session_state.get('active_project_name', 'N/A')}")
+    project_id = project['id']
+    st.subheader(f"Project: {project['name']}")
     
     # Add custom task
     with st.expander("➕ Add Custom Task"):
@@ -332,53 +353,70 @@ def show_task_tracking():
     
     st.divider()
     
-    # Display and edit tasks
-    tasks = get_records('tasks', 'project_id = %s', (project_id,))
+    # Overall progress is aggregated in SQL, so the metric doesn't need the task rows
+    summary = get_task_summary(project_id)
     
-    if tasks:
-        # Show overall progress
-        overall_progress = calculate_task_completion(tasks)
+    if summary['total']:
+        overall_progress = summary['average_progress']
         st.metric("Overall Project Completion", f"{overall_progress:.1f}%")
         st.progress(overall_progress / 100)
         
         st.subheader("📋 Task List")
         
-        for task in tasks:
-            with st.expander(f"{'✓' if task['progress_percent'] == 100 else '○'} {task['title']} ({task['progress_percent']}%)"):
-                if task['description']:
-                    st.write(f"**Description:** {task['description']}")
-                
-                # Progress slider
-                progress = st.slider(
-                    "Progress", 
-                    0, 100, 
-                    task['progress_percent'],
-                    key=f"progress_{task['id']}"
-                )
-                
-                # Comments
-                comments = st.text_area(
-                    "Comments",
-                    task['comments'] or '',
-                    key=f"comments_{task['id']}"
-                )
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("💾 Save Changes", key=f"save_task_{task['id']}"):
-                        update_data = {
-                            'progress_percent': progress,
-                            'comments': comments
-                        }
-                        update_record('tasks', update_data, 'id = %s', (task['id'],))
-                        show_success("Task updated!")
-                        st.rerun()
+        # The rows are only fetched while the editor is shown
+        if not st.toggle("Show task list", value=True, key=f"tasks_expanded_{project_id}"):
+            return
+        
+        tasks = cached_get_records('tasks', 'project_id = %s', (project_id,))
+        
+        # One grid widget for all rows; edits are saved with a single UPDATE
+        tasks_df = pd.DataFrame({
+            'done': [task['progress_percent'] == 100 for task in tasks],
+            'title': [task['title'] for task in tasks],
+            'description': [task['description'] or '' for task in tasks],
+            'progress_percent': [task['progress_percent'] for task in tasks],
+            'comments': [task['comments'] or '' for task in tasks],
+            'delete': False
+        })
+        
+        with st.form(f"edit_tasks_{project_id}"):
+            edited_df = st.data_editor(
+                tasks_df,
+                column_config={
+                    'done': st.column_config.CheckboxColumn("✓", width="small"),
+                    'title': st.column_config.TextColumn("Task"),
+                    'description': st.column_config.TextColumn("Description"),
+                    'progress_percent': st.column_config.NumberColumn(
+                        "Progress (%)", min_value=0, max_value=100, step=1, required=True),
+                    'comments': st.column_config.TextColumn("Comments"),
+                    'delete': st.column_config.CheckboxColumn("🗑️ Delete")
+                },
+                disabled=['done', 'title', 'description'],
+                hide_index=True,
+                use_container_width=True,
+                key=f"tasks_editor_{project_id}"
+            )
+            
+            if st.form_submit_button("💾 Save All Changes", type="primary"):
+                edited_tasks = []
+                tasks_to_delete = []
+                # Rows come back in the same order they were passed in
+                for task, row in zip(tasks, edited_df.itertuples(index=False)):
+                    if row.delete:
+                        tasks_to_delete.append(task['id'])
+                    elif row.progress_percent != task['progress_percent'] or row.comments != (task['comments'] or ''):
+                        edited_tasks.append({
+                            'id': task['id'],
+                            'progress_percent': int(row.progress_percent),
+                            'comments': row.comments or ''
+                        })
                 
-                with col2:
-                    if st.button("🗑️ Delete Task", key=f"del_task_{task['id']}"):
-                        delete_record('tasks', 'id = %s', (task['id'],))
-                        show_success("Task deleted!")
-                        st.rerun()
+                update_many('tasks', edited_tasks)
+                if tasks_to_delete:
+                    placeholders = ', '.join(['%s'] * len(tasks_to_delete))
+                    delete_record('tasks', f"id IN ({placeholders})", tuple(tasks_to_delete))
+                show_success("Tasks updated!")
+                st.rerun()
     else:
         show_info("No tasks found. Add some custom tasks above!")
 
@@ -393,40 +431,35 @@ def show_whiteboard_notes():
     """
     st.header("📝 Whiteboard & Notes")
     
-    project_id = st.session_state.get('active_project_id')
-    if not project_id:
+    project = st.session_state.get('active_project')
+    if not project:
         show_warning("Please select a project from Project Management first")
         return
     
-    st.subheader(f"Project: {st.session_state.get('active_project_name', 'N/A')}")
+    project_id = project['id']
+    st.subheader(f"Project: {project['name']}")
     
     # Text notes section
     st.subheader("📄 Text Notes")
     
-    # Get existing notes
-    notes = get_records('notes_whiteboard', 'project_id = %s', (project_id,))
+    # Get the project's note (project_id is unique; LIMIT 1 guards older databases)
+    notes = cached_get_records('notes_whiteboard', 'project_id = %s ORDER BY id',
+                               (project_id,), columns='text_note, drawing_path', limit=1)
+    note = notes[0] if notes else None
     
     # Note input
     note_text = st.text_area("Add/Edit Note", 
-                            value=notes[0]['text_note'] if notes else '',
+                            value=note['text_note'] if note else '',
                             height=200)
     
+    # Saves upsert on the unique project_id and update the local copy instead
+    # of rerunning; the text area already shows what was typed
     if st.button("💾 Save Note", type="primary"):
-        if notes:
-            # Update existing note
-            update_record('notes_whiteboard', 
-                         {'text_note': note_text}, 
-                         'id = %s', 
-                         (notes[0]['id'],))
-        else:
-            # Create new note
-            note_data = {
-                'project_id': project_id,
-                'text_note': note_text
-            }
-            insert_record('notes_whiteboard', note_data)
+        upsert_record('notes_whiteboard',
+                      {'project_id': project_id, 'text_note': note_text},
+                      ('text_note',))
+        note = {**(note or {'drawing_path': None}), 'text_note': note_text}
         show_success("Note saved successfully!")
-        st.rerun()
     
     st.divider()
     
@@ -434,11 +467,11 @@ def show_whiteboard_notes():
     st.subheader("🎨 Drawing Canvas")
     st.info("💡 Use streamlit-drawable-canvas for sketching. Install: `pip install streamlit-drawable-canvas`")
     
-    try:
-        from streamlit_drawable_canvas import st_canvas
-        
+    if st_canvas is None:
+        st.error("Please install streamlit-drawable-canvas: `pip install streamlit-drawable-canvas`")
+    else:
         # Canvas settings
-        drawing_mode = st.selectbox("Drawing tool:", ("freedraw", "line", "rect", "circle", "transform"))
+        drawing_mode = st.selectbox("Drawing tool:", config.DRAWING_MODES)
         stroke_width = st.slider("Stroke width:", 1, 25, 3)
         stroke_color = st.color_picker("Stroke color:", "#000000")
         
@@ -449,60 +482,35 @@ def show_whiteboard_notes():
             drawing_mode=drawing_mode,
             height=400,
             width=700,
-            key="canvas"
+            key=f"canvas_{project_id}"
         )
         
         if st.button("💾 Save Drawing"):
             if canvas_result.image_data is not None:
-                # Save canvas as image
-                from PIL import Image
-                import numpy as np
-                
-                img = Image.fromarray(canvas_result.image_data.astype('uint8'), 'RGBA')
-                import io
-                
-                # Save to file
-                img_bytes = io.BytesIO()
-                img.save(img_bytes, format='PNG')
-                img_bytes.seek(0)
+                # Save canvas as image; the canvas already returns contiguous uint8 RGBA,
+                # so this wraps its buffer instead of copying it
+                pixels = np.ascontiguousarray(canvas_result.image_data, dtype=np.uint8)
+                height, width = pixels.shape[:2]
+                img = Image.frombuffer('RGBA', (width, height), pixels, 'raw', 'RGBA', 0, 1)
                 
-                # Create a mock uploaded file object
-                class MockUploadedFile:
-                    def __init__(self, bytes_data, name):
-                        self.name = name
-                        self._bytes = bytes_data
-                    
-                    def getbuffer(self):
-                        return self._bytes.getvalue()
-                
-                mock_file = MockUploadedFile(img_bytes, f"whiteboard_{project_id}.png")
-                file_path = save_uploaded_file(mock_file, project_id, 'whiteboard')
+                # Encode straight to disk; zlib level 1 is several times faster than
+                # the default 6 and canvas drawings are mostly flat colour
+                file_path = save_image(img, project_id, 'whiteboard',
+                                       f"whiteboard_{project_id}.png", compress_level=1)
                 
                 if file_path:
-                    # Update or create whiteboard record
-                    if notes:
-                        update_record('notes_whiteboard',
-                                    {'drawing_path': file_path},
-                                    'id = %s',
-                                    (notes[0]['id'],))
-                    else:
-                        wb_data = {
-                            'project_id': project_id,
-                            'drawing_path': file_path,
-                            'text_note': ''
-                        }
-                        insert_record('notes_whiteboard', wb_data)
+                    # Update or create whiteboard record in one statement
+                    upsert_record('notes_whiteboard',
+                                  {'project_id': project_id, 'drawing_path': file_path, 'text_note': ''},
+                                  ('drawing_path',))
+                    note = {**(note or {'text_note': ''}), 'drawing_path': file_path}
                     
                     show_success("Drawing saved!")
-                    st.rerun()
-    
-    except ImportError:
-        st.error("Please install streamlit-drawable-canvas: `pip install streamlit-drawable-canvas`")
     
     # Display saved drawing
-    if notes and notes[0].get('drawing_path'):
+    if note and note.get('drawing_path'):
         st.subheader("📌 Saved Drawing")
-        display_image(notes[0]['drawing_path'])
+        display_image(note['drawing_path'])
 
 # =====================================================
 # MAIN DESIGNER DASHBOARD FUNCTION
@@ -517,8 +525,9 @@ def show_designer_dashboard():
     st.sidebar.write(f"Welcome, {st.session_state.get('user_name', 'Designer')}!")
     
     # Show active project info
-    if st.session_state.get('active_project_id'):
-        st.sidebar.success(f"📁 Active: {st.session_state.get('active_project_name')}")
+    active_project = st.session_state.get('active_project')
+    if active_project:
+        st.sidebar.success(f"📁 Active: {active_project['name']}")
     else:
         st.sidebar.info("ℹ️ No project selected")
     
@@ -565,10 +574,6 @@ Designer Budget Management Module
 Handles budget overview and expense tracking
 """
 
-import streamlit as st
-from database import insert_record, get_records, update_record, delete_record
-from utils import format_currency, show_success, show_error, show_info, calculate_budget_statistics
-
 def show_budget_overview():
     """
     Display budget overview interface
@@ -576,15 +581,16 @@ def show_budget_overview():
     """
     st.header("💰 Budget Overview")
     
-    project_id = st.session_state.get('active_project_id')
-    if not project_id:
+    project = st.session_state.get('active_project')
+    if not project:
         show_info("Please select a project from Project Management first")
         return
     
-    st.subheader(f"Project: {st.session_state.get('active_project_name', 'N/A')}")
+    project_id = project['id']
+    st.subheader(f"Project: {project['name']}")
     
     # Get all budget items
-    budget_items = get_records('budget_items', 'project_id = %s', (project_id,))
+    budget_items = cached_get_records('budget_items', 'project_id = %s', (project_id,))
     
     if budget_items:
         # Calculate statistics
@@ -610,45 +616,51 @@ def show_budget_overview():
         # Display and edit budget items
         st.subheader("📊 Budget Items")
         
-        for item in budget_items:
-            with st.expander(f"💵 {item['item_name']}"):
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    estimated = st.number_input(
-                        "Estimated Cost (₹)",
-                        min_value=0.0,
-                        value=float(item['estimated_cost']),
-                        step=1000.0,
-                        key=f"est_{item['id']}"
-                    )
-                
-                with col2:
-                    actual = st.number_input(
-                        "Actual Cost (₹)",
-                        min_value=0.0,
-                        value=float(item['actual_cost']),
-                        step=1000.0,
-                        key=f"act_{item['id']}"
-                    )
-                
-                col_save, col_delete = st.columns(2)
-                
-                with col_save:
-                    if st.button("💾 Save", key=f"save_budget_{item['id']}"):
-                        update_data = {
-                            'estimated_cost': estimated,
-                            'actual_cost': actual
-                        }
-                        update_record('budget_items', update_data, 'id = %s', (item['id'],))
-                        show_success("Budget item updated!")
-                        st.rerun()
+        # One grid widget for all rows; edits are saved with a single UPDATE
+        budget_df = pd.DataFrame({
+            'item_name': [item['item_name'] for item in budget_items],
+            'estimated_cost': [float(item['estimated_cost']) for item in budget_items],
+            'actual_cost': [float(item['actual_cost']) for item in budget_items],
+            'delete': False
+        })
+        
+        with st.form(f"edit_budget_items_{project_id}"):
+            edited_df = st.data_editor(
+                budget_df,
+                column_config={
+                    'item_name': st.column_config.TextColumn("Item"),
+                    'estimated_cost': st.column_config.NumberColumn(
+                        "Estimated Cost (₹)", min_value=0.0, step=1000.0, format="₹%.2f", required=True),
+                    'actual_cost': st.column_config.NumberColumn(
+                        "Actual Cost (₹)", min_value=0.0, step=1000.0, format="₹%.2f", required=True),
+                    'delete': st.column_config.CheckboxColumn("🗑️ Delete")
+                },
+                disabled=['item_name'],
+                hide_index=True,
+                use_container_width=True,
+                key=f"budget_editor_{project_id}"
+            )
+            
+            if st.form_submit_button("💾 Save All Changes", type="primary"):
+                edited_items = []
+                items_to_delete = []
+                # Rows come back in the same order they were passed in
+                for item, row in zip(budget_items, edited_df.itertuples(index=False)):
+                    if row.delete:
+                        items_to_delete.append(item['id'])
+                    elif row.estimated_cost != float(item['estimated_cost']) or row.actual_cost != float(item['actual_cost']):
+                        edited_items.append({
+                            'id': item['id'],
+                            'estimated_cost': float(row.estimated_cost),
+                            'actual_cost': float(row.actual_cost)
+                        })
                 
-                with col_delete:
-                    if st.button("🗑️ Delete", key=f"del_budget_{item['id']}"):
-                        delete_record('budget_items', 'id = %s', (item['id'],))
-                        show_success("Budget item deleted!")
-                        st.rerun()
+                update_many('budget_items', edited_items)
+                if items_to_delete:
+                    placeholders = ', '.join(['%s'] * len(items_to_delete))
+                    delete_record('budget_items', f"id IN ({placeholders})", tuple(items_to_delete))
+                show_success("Budget items updated!")
+                st.rerun()
         
         st.divider()
     
@@ -686,9 +698,62 @@ Designer Suppliers Management Module
 Handles supplier contact information and search
 """
 
-import streamlit as st
-from database import insert_record, get_records, update_record, delete_record
-from utils import show_success, show_error, show_info
+# Word tokens as split by the MySQL full-text parser
+SEARCH_TOKEN_PATTERN = re.compile(r'\w+')
+
+def build_supplier_search(search_term, contains=False):
+    """
+    Build the WHERE clause and parameters for a supplier search
+    Uses the ft_suppliers FULLTEXT index, requiring every word as a prefix;
+    terms with no word long enough to be indexed fall back to a
+    prefix LIKE on name, which can use idx_name. Without the index (an
+    older database it could not be added to) the "contains" search is used
+    
+    Args:
+        search_term: Text typed into the search box
+        contains: Match the term anywhere in name, category, phone or email
+                  instead (cannot use an index, so every row is scanned)
+    
+    Returns:
+        Tuple of (condition, params)
+    """
+    if contains or not has_index('suppliers', 'ft_suppliers'):
+        pattern = f'%{escape_like(search_term)}%'
+        # Parenthesised so the condition stays intact when ANDed with another
+        return ('(name LIKE %s OR category LIKE %s OR phone LIKE %s OR email LIKE %s)',
+                (pattern,) * 4)
+    
+    words = [word for word in SEARCH_TOKEN_PATTERN.findall(search_term)
+             if len(word) >= config.FULLTEXT_MIN_TOKEN_SIZE]
+    if not words:
+        return 'name LIKE %s', (f'{escape_like(search_term)}%',)
+    
+    boolean_query = ' '.join(f'+{word}*' for word in words)
+    return ('MATCH(name, category, phone, email) AGAINST (%s IN BOOLEAN MODE)',
+            (boolean_query,))
+
+# Columns accepted by the CSV import, in insert order
+SUPPLIER_IMPORT_COLUMNS = ('name', 'category', 'phone', 'email', 'address')
+
+def read_supplier_csv(csv_file):
+    """
+    Parse an uploaded supplier CSV into rows for insert_many
+    Unknown columns are ignored and rows without a name are skipped
+    
+    Args:
+        csv_file: Uploaded CSV file with a header row
+    
+    Returns:
+        List of supplier dictionaries with SUPPLIER_IMPORT_COLUMNS keys
+    """
+    # utf-8-sig drops the byte order mark spreadsheet exports often add
+    reader = csv.DictReader(io.TextIOWrapper(csv_file, encoding='utf-8-sig', newline=''))
+    rows = []
+    for record in reader:
+        row = {column: (record.get(column) or '').strip() for column in SUPPLIER_IMPORT_COLUMNS}
+        if row['name']:
+            rows.append(row)
+    return rows
 
 def show_suppliers_management():
     """
@@ -699,93 +764,34 @@ def show_suppliers_management():
     
     # Search bar
     st.subheader("🔍 Search Suppliers")
-    search_term = st.text_input("Search by name, category, or contact", placeholder="Enter search term...")
-    
-    # Get all suppliers
+    col_search, col_contains = st.columns([4, 1])
+    with col_search:
+        search_term = st.text_input("Search by name, category, or contact", placeholder="Enter search term...")
+    with col_contains:
+        contains = st.checkbox("Contains", help="Match anywhere in name, category or contact details (slower)")
+    
+    # Search in name, category, phone, email
+    condition, params = None, None
     if search_term:
-        # Search in name, category, phone, email
-        suppliers = get_records('suppliers', 
-                               'name LIKE %s OR category LIKE %s OR phone LIKE %s OR email LIKE %s',
-                               (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%', f'%{search_term}%'))
-    else:
-        suppliers = get_records('suppliers')
+        condition, params = build_supplier_search(search_term.strip(), contains)
+    
+    total = cached_get_records('suppliers', condition, params, columns='COUNT(*) AS total')[0]['total']
     
-    # Display suppliers
-    if suppliers:
-        st.subheader(f"📋 Suppliers ({len(suppliers)} found)")
+    # Display suppliers, one page at a time
+    if total:
+        st.subheader(f"📋 Suppliers ({total} found)")
         
-        # Group by category
-        categories = {}
-        for supplier in suppliers:
-            cat = supplier.get('category', 'Uncategorized')
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append(supplier)
+        limit, offset = show_page_selector(total, key="suppliers_page")
+        suppliers = cached_get_records('suppliers', condition, params, order_by='category, name',
+                                       limit=limit, offset=offset)
         
-        # Display by category
-        for category, supplier_list in categories.items():
-            with st.expander(f"📁 {category} ({len(supplier_list)} suppliers)"):
+        # Rows arrive sorted by category, so each group is one contiguous run
+        for category, group in groupby(suppliers, key=itemgetter('category')):
+            supplier_list = list(group)
+            with st.expander(f"📁 {category or 'Uncategorized'} ({len(supplier_list)} suppliers)"):
+                # Each supplier reruns on its own while its edit form is toggled
                 for supplier in supplier_list:
-                    st.markdown(f"### {supplier['name']}")
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.write(f"**📞 Phone:** {supplier['phone'] or 'N/A'}")
-                        st.write(f"**📧 Email:** {supplier['email'] or 'N/A'}")
-                    with col2:
-                        st.write(f"**🏷️ Category:** {supplier['category'] or 'N/A'}")
-                        st.write(f"**📍 Address:** {supplier['address'] or 'N/A'}")
-                    
-                    col_edit, col_delete = st.columns(2)
-                    with col_edit:
-                        if st.button("✏️ Edit", key=f"edit_sup_{supplier['id']}"):
-                            st.session_state[f'edit_supplier_{supplier["id"]}'] = True
-                            st.rerun()
-                    
-                    with col_delete:
-                        if st.button("🗑️ Delete", key=f"del_sup_{supplier['id']}"):
-                            delete_record('suppliers', 'id = %s', (supplier['id'],))
-                            show_success("Supplier deleted!")
-                            st.rerun()
-                    
-                    # Edit form
-                    if st.session_state.get(f'edit_supplier_{supplier["id"]}'):
-                        with st.form(f"edit_supplier_form_{supplier['id']}"):
-                            st.write("**Edit Supplier**")
-                            
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                new_name = st.text_input("Name", value=supplier['name'])
-                                new_category = st.text_input("Category", value=supplier['category'] or '')
-                                new_phone = st.text_input("Phone", value=supplier['phone'] or '')
-                            with col2:
-                                new_email = st.text_input("Email", value=supplier['email'] or '')
-                                new_address = st.text_area("Address", value=supplier['address'] or '')
-                            
-                            col_save, col_cancel = st.columns(2)
-                            with col_save:
-                                save = st.form_submit_button("💾 Save Changes")
-                            with col_cancel:
-                                cancel = st.form_submit_button("❌ Cancel")
-                            
-                            if save:
-                                update_data = {
-                                    'name': new_name,
-                                    'category': new_category,
-                                    'phone': new_phone,
-                                    'email': new_email,
-                                    'address': new_address
-                                }
-                                update_record('suppliers', update_data, 'id = %s', (supplier['id'],))
-                                del st.session_state[f'edit_supplier_{supplier["id"]}']
-                                show_success("Supplier updated!")
-                                st.rerun()
-                            
-                            if cancel:
-                                del st.session_state[f'edit_supplier_{supplier["id"]}']
-                                st.rerun()
-                    
-                    st.divider()
+                    show_supplier_item(supplier)
     else:
         show_info("No suppliers found. Add some below!")
     
@@ -799,9 +805,7 @@ def show_suppliers_management():
         
         with col1:
             name = st.text_input("Supplier Name*", placeholder="ABC Furniture Co.")
-            category = st.selectbox("Category", 
-                                   ["Furniture", "Lighting", "Paint", "Flooring", 
-                                    "Electricals", "Plumbing", "Fabrics", "Accessories", "Other"])
+            category = st.selectbox("Category", config.SUPPLIER_CATEGORIES)
             phone = st.text_input("Phone", placeholder="+91 XXXXXXXXXX")
         
         with col2:
@@ -824,6 +828,91 @@ def show_suppliers_management():
                 insert_record('suppliers', supplier_data)
                 show_success("Supplier added successfully!")
                 st.rerun()
+    
+    # Bulk import
+    st.subheader("📥 Import Suppliers from CSV")
+    st.caption(f"Header row with columns: {', '.join(SUPPLIER_IMPORT_COLUMNS)} (only name is required)")
+    
+    with st.form("import_suppliers"):
+        csv_file = st.file_uploader("Choose CSV file", type=['csv'])
+        submit_import = st.form_submit_button("Import Suppliers")
+        
+        if submit_import and csv_file:
+            supplier_rows = read_supplier_csv(csv_file)
+            if not supplier_rows:
+                show_error("No rows with a supplier name found in the file")
+            else:
+                # One multi-row INSERT for the whole file
+                insert_many('suppliers', supplier_rows)
+                show_success(f"Imported {len(supplier_rows)} suppliers!")
+                st.rerun()
+
+@st.fragment
+def show_supplier_item(supplier):
+    """
+    Display one supplier with its edit and delete controls
+    Runs as a fragment so opening or cancelling the edit form only reruns this supplier
+    
+    Args:
+        supplier: Supplier record dictionary
+    """
+    # IDs of suppliers whose edit form is open
+    editing = st.session_state.setdefault('editing_suppliers', set())
+    supplier_id = supplier['id']
+    
+    # One markdown element per supplier instead of one per field
+    st.markdown(
+        f"### {supplier['name']}\n\n"
+        f"**📞 Phone:** {supplier['phone'] or 'N/A'} &nbsp;&nbsp; "
+        f"**📧 Email:** {supplier['email'] or 'N/A'}\n\n"
+        f"**🏷️ Category:** {supplier['category'] or 'N/A'} &nbsp;&nbsp; "
+        f"**📍 Address:** {supplier['address'] or 'N/A'}"
+    )
+    
+    col_edit, col_delete = st.columns(2)
+    with col_edit:
+        # Callback runs before the fragment rerun, so the form below opens right away
+        st.button("✏️ Edit", key=f"edit_sup_{supplier_id}",
+                  on_click=editing.add, args=(supplier_id,))
+    
+    with col_delete:
+        if st.button("🗑️ Delete", key=f"del_sup_{supplier_id}"):
+            delete_record('suppliers', 'id = %s', (supplier_id,))
+            show_success("Supplier deleted!")
+            st.rerun()
+    
+    # Edit form
+    if supplier_id in editing:
+        with st.form(f"edit_supplier_form_{supplier_id}"):
+            st.write("**Edit Supplier**")            
+            col1, col2 = st.columns(2)
+            with col1:
+                new_name = st.text_input("Name", value=supplier['name'])
+                new_category = st.text_input("Category", value=supplier['category'] or '')
+                new_phone = st.text_input("Phone", value=supplier['phone'] or '')
+            with col2:
+                new_email = st.text_input("Email", value=supplier['email'] or '')
+                new_address = st.text_area("Address", value=supplier['address'] or '')            
+            col_save, col_cancel = st.columns(2)
+            with col_save:
+                save = st.form_submit_button("💾 Save Changes")
+            with col_cancel:
+                st.form_submit_button("❌ Cancel", on_click=editing.discard,
+                                      args=(supplier_id,))            
+            if save:
+                update_data = {
+                    'name': new_name,
+                    'category': new_category,
+                    'phone': new_phone,
+                    'email': new_email,
+                    'address': new_address
+                }
+                update_record('suppliers', update_data, 'id = %s', (supplier_id,))
+                editing.discard(supplier_id)
+                show_success("Supplier updated!")
+                st.rerun()
+    
+    st.divider()
 
 # =====================================================
 # 7. MEASUREMENTS & DRAWINGS
@@ -833,11 +922,6 @@ Designer Measurements & Drawings Module
 Handles CAD files and site measurements
 """
 
-import streamlit as st
-from database import insert_record, get_records, delete_record, update_record
-from utils import save_uploaded_file, display_image, show_success, show_error, show_info, format_datetime
-import config
-
 def show_measurements_drawings():
     """
     Display measurements and drawings interface
@@ -845,29 +929,34 @@ def show_measurements_drawings():
     """
     st.header("📐 Measurements & Drawings")
     
-    project_id = st.session_state.get('active_project_id')
-    if not project_id:
+    project = st.session_state.get('active_project')
+    if not project:
         show_info("Please select a project from Project Management first")
         return
     
-    st.subheader(f"Project: {st.session_state.get('active_project_name', 'N/A')}")
+    project_id = project['id']
+    st.subheader(f"Project: {project['name']}")
+    
+    # Count both tabs' drawings in one query
+    totals = get_measurement_counts(project_id)
     
     # Two tabs for existing and proposed
     tab1, tab2 = st.tabs(["📏 Existing Site Drawings", "🎨 Proposed Design Drawings"])
     
     with tab1:
-        show_measurement_section(project_id, 'existing')
+        show_measurement_section(project_id, 'existing', totals['existing'])
     
     with tab2:
-        show_measurement_section(project_id, 'proposed')
+        show_measurement_section(project_id, 'proposed', totals['proposed'])
 
-def show_measurement_section(project_id, measurement_type):
+def show_measurement_section(project_id, measurement_type, total):
     """
     Display measurement section for a specific type
     
     Args:
         project_id: Project ID
         measurement_type: 'existing' or 'proposed'
+        total: Number of drawings of this type in the project
     """
     type_title = "Existing Site" if measurement_type == 'existing' else "Proposed Design"
     
@@ -879,13 +968,13 @@ def show_measurement_section(project_id, measurement_type):
         uploaded_file = st.file_uploader(
             f"Choose file (CAD/Image)", 
             type=config.ALLOWED_DRAWING_EXTENSIONS,
-            key=f"upload_{measurement_type}"
+            key=f"upload_{project_id}_{measurement_type}"
         )
     with col2:
-        notes = st.text_area("Notes", key=f"notes_{measurement_type}", 
+        notes = st.text_area("Notes", key=f"notes_{project_id}_{measurement_type}", 
                             placeholder="Add any notes about this drawing...")
     
-    if st.button(f"Upload Drawing", key=f"btn_upload_{measurement_type}", type="primary") and uploaded_file:
+    if st.button(f"Upload Drawing", key=f"btn_upload_{project_id}_{measurement_type}", type="primary") and uploaded_file:
         file_path = save_uploaded_file(uploaded_file, project_id, 'drawing')
         if file_path:
             measurement_data = {
@@ -903,46 +992,68 @@ def show_measurement_section(project_id, measurement_type):
     # Display existing measurements
     st.subheader(f"📁 Existing {type_title} Drawings")
     
-    measurements = get_records('measurements', 
-                              'project_id = %s AND type = %s', 
-                              (project_id, measurement_type))
-    
-    if measurements:
+    if total:
+        limit, offset = show_page_selector(total, key=f"meas_page_{project_id}_{measurement_type}")
+        measurements = cached_get_records('measurements', 'project_id = %s AND type = %s',
+                                         (project_id, measurement_type),
+                                         order_by='uploaded_at DESC', limit=limit, offset=offset)
+        
+        # Each drawing reruns on its own while its notes are edited
         for measurement in measurements:
-            with st.expander(f"📄 Drawing #{measurement['id']} - {format_datetime(measurement['uploaded_at'])}"):
-                # Display image if it's an image file
-                file_ext = measurement['file_path'].split('.')[-1].lower()
-                if file_ext in ['png', 'jpg', 'jpeg', 'gif']:
-                    display_image(measurement['file_path'])
-                else:
-                    st.info(f"📎 File: {measurement['file_path'].split('/')[-1]}")
-                
-                if measurement['notes']:
-                    st.write(f"**Notes:** {measurement['notes']}")
-                
-                # Edit notes
-                new_notes = st.text_area("Update Notes", 
-                                        value=measurement['notes'] or '',
-                                        key=f"edit_notes_{measurement['id']}")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("💾 Save Notes", key=f"save_meas_{measurement['id']}"):
-                        update_record('measurements', 
-                                    {'notes': new_notes}, 
-                                    'id = %s', 
-                                    (measurement['id'],))
-                        show_success("Notes updated!")
-                        st.rerun()
-                
-                with col2:
-                    if st.button("🗑️ Delete", key=f"del_meas_{measurement['id']}"):
-                        delete_record('measurements', 'id = %s', (measurement['id'],))
-                        show_success("Drawing deleted!")
-                        st.rerun()
+            show_measurement_item(measurement)
     else:
         show_info(f"No {type_title.lower()} drawings uploaded yet")
 
+@st.fragment
+def show_measurement_item(measurement):
+    """
+    Display one uploaded drawing with its editable notes
+    Runs as a fragment so editing the notes only reruns this drawing
+    
+    Args:
+        measurement: Measurement record dictionary
+    """
+    # Widget key suffix shared by this drawing's widgets
+    key_suffix = f"{measurement['project_id']}_{measurement['id']}"
+    
+    with st.expander(f"📄 Drawing #{measurement['id']} - {format_datetime(measurement['uploaded_at'])}"):
+        # Display image if it's an image file
+        file_ext = os.path.splitext(measurement['file_path'])[1][1:].lower()
+        if file_ext in config.PREVIEWABLE_IMAGE_EXTENSIONS:
+            # Expander bodies always run, so only load the image on request
+            if st.toggle("Show drawing", key=f"show_meas_{key_suffix}"):
+                # Thumbnail written at upload time; decode the original only on request
+                if st.toggle("View full size", key=f"full_meas_{key_suffix}"):
+                    display_image(measurement['file_path'])
+                else:
+                    display_image(measurement['file_path'], width=config.THUMBNAIL_SIZE[0])
+        else:
+            st.info(f"📎 File: {os.path.basename(measurement['file_path'])}")
+        
+        if measurement['notes']:
+            st.write(f"**Notes:** {measurement['notes']}")
+        
+        # Edit notes
+        new_notes = st.text_area("Update Notes", 
+                                value=measurement['notes'] or '',
+                                key=f"edit_notes_{key_suffix}")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("💾 Save Notes", key=f"save_meas_{key_suffix}"):
+                update_record('measurements', 
+                            {'notes': new_notes}, 
+                            'id = %s', 
+                            (measurement['id'],))
+                show_success("Notes updated!")
+                st.rerun()
+        
+        with col2:
+            if st.button("🗑️ Delete", key=f"del_meas_{key_suffix}"):
+                delete_record('measurements', 'id = %s', (measurement['id'],))
+                show_success("Drawing deleted!")
+                st.rerun()
+
 # =====================================================
 # 8. CLIENT TIMELINE
 # =====================================================
@@ -951,11 +1062,6 @@ Designer Timeline Module
 Manage project milestones and deadlines
 """
 
-import streamlit as st
-from database import insert_record, get_records, update_record, delete_record
-from utils import format_date, show_success, show_error, show_info
-from datetime import date
-
 def show_client_timeline():
     """
     Display timeline management interface
@@ -963,78 +1069,58 @@ def show_client_timeline():
     """
     st.header("📅 Client Timeline")
     
-    project_id = st.session_state.get('active_project_id')
-    if not project_id:
+    project = st.session_state.get('active_project')
+    if not project:
         show_info("Please select a project from Project Management first")
         return
     
-    st.subheader(f"Project: {st.session_state.get('active_project_name', 'N/A')}")
-    
-    # Get all timeline items
-    timeline_items = get_records('timeline', 'project_id = %s ORDER BY deadline', (project_id,))
+    project_id = project['id']
+    st.subheader(f"Project: {project['name']}")
+    
+    # Fetch one page of milestones plus one extra row to know whether a
+    # further page exists; the rows themselves decide what is shown
+    page_key = f"timeline_page_{project_id}"
+    page = st.session_state.get(page_key, 0)
+    page_size = config.LIST_PAGE_SIZE
+    timeline_items = cached_get_records('timeline', 'project_id = %s ORDER BY deadline, id', (project_id,),
+                                        limit=page_size + 1, offset=page * page_size)
+    if not timeline_items and page:
+        # Reset a page left over from before rows were deleted
+        page = st.session_state[page_key] = 0
+        timeline_items = cached_get_records('timeline', 'project_id = %s ORDER BY deadline, id', (project_id,),
+                                            limit=page_size + 1)
+    has_next = len(timeline_items) > page_size
+    timeline_items = timeline_items[:page_size]
     
     if timeline_items:
         st.subheader("📋 Project Milestones")
         
-        # Group by status
-        pending = [t for t in timeline_items if t['status'] == 'pending']
-        in_progress = [t for t in timeline_items if t['status'] == 'in_progress']
-        completed = [t for t in timeline_items if t['status'] == 'completed']
-        
-        # Display counts
+        # Display counts (read from timeline_summary)
+        status_counts = get_timeline_status_counts(project_id)
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("⏳ Pending", len(pending))
+            st.metric("⏳ Pending", status_counts['pending'])
         with col2:
-            st.metric("🔄 In Progress", len(in_progress))
+            st.metric("🔄 In Progress", status_counts['in_progress'])
         with col3:
-            st.metric("✅ Completed", len(completed))
+            st.metric("✅ Completed", status_counts['completed'])
         
         st.divider()
         
-        # Display all milestones
+        # Each row reruns on its own
         for item in timeline_items:
-            status_emoji = {
-                'pending': '⏳',
-                'in_progress': '🔄',
-                'completed': '✅'
-            }
-            
-            with st.expander(f"{status_emoji[item['status']]} {item['milestone']} - {format_date(item['deadline'])}"):
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    new_milestone = st.text_input("Milestone", 
-                                                 value=item['milestone'],
-                                                 key=f"mile_{item['id']}")
-                    new_deadline = st.date_input("Deadline", 
-                                                value=item['deadline'],
-                                                key=f"dead_{item['id']}")
-                
-                with col2:
-                    new_status = st.selectbox("Status",
-                                            ['pending', 'in_progress', 'completed'],
-                                            index=['pending', 'in_progress', 'completed'].index(item['status']),
-                                            key=f"stat_{item['id']}")
-                
-                col_save, col_delete = st.columns(2)
-                
-                with col_save:
-                    if st.button("💾 Save", key=f"save_time_{item['id']}"):
-                        update_data = {
-                            'milestone': new_milestone,
-                            'deadline': new_deadline,
-                            'status': new_status
-                        }
-                        update_record('timeline', update_data, 'id = %s', (item['id'],))
-                        show_success("Milestone updated!")
-                        st.rerun()
-                
-                with col_delete:
-                    if st.button("🗑️ Delete", key=f"del_time_{item['id']}"):
-                        delete_record('timeline', 'id = %s', (item['id'],))
-                        show_success("Milestone deleted!")
-                        st.rerun()
+            show_timeline_milestone(item)
+        
+        if page or has_next:
+            col_prev, col_next = st.columns(2)
+            with col_prev:
+                if page:
+                    st.button("⬅️ Previous", key=f"timeline_prev_{project_id}",
+                              on_click=st.session_state.update, args=({page_key: page - 1},))
+            with col_next:
+                if has_next:
+                    st.button("Next ➡️", key=f"timeline_next_{project_id}",
+                              on_click=st.session_state.update, args=({page_key: page + 1},))
     else:
         show_info("No milestones added yet")
     
@@ -1051,7 +1137,7 @@ def show_client_timeline():
         with col2:
             deadline = st.date_input("Deadline", value=date.today())
         with col3:
-            status = st.selectbox("Status", ['pending', 'in_progress', 'completed'])
+            status = st.selectbox("Status", config.TIMELINE_STATUSES)
         
         submit = st.form_submit_button("Add Milestone", type="primary")
         
@@ -1069,6 +1155,54 @@ def show_client_timeline():
                 show_success("Milestone added successfully!")
                 st.rerun()
 
+@st.fragment
+def show_timeline_milestone(item):
+    """
+    Display one editable milestone
+    Runs as a fragment so editing its fields only reruns this row
+    
+    Args:
+        item: Timeline record dictionary
+    """
+    # Widget key suffix shared by this milestone's widgets
+    key_suffix = f"{item['project_id']}_{item['id']}"
+    
+    with st.expander(f"{config.TIMELINE_STATUS_EMOJI[item['status']]} {item['milestone']} - {format_date(item['deadline'])}"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            new_milestone = st.text_input("Milestone", 
+                                         value=item['milestone'],
+                                         key=f"mile_{key_suffix}")
+            new_deadline = st.date_input("Deadline", 
+                                        value=item['deadline'],
+                                        key=f"dead_{key_suffix}")
+        
+        with col2:
+            new_status = st.selectbox("Status",
+                                    config.TIMELINE_STATUSES,
+                                    index=config.TIMELINE_STATUS_INDEX[item['status']],
+                                    key=f"stat_{key_suffix}")
+        
+        col_save, col_delete = st.columns(2)
+        
+        with col_save:
+            if st.button("💾 Save", key=f"save_time_{key_suffix}"):
+                update_data = {
+                    'milestone': new_milestone,
+                    'deadline': new_deadline,
+                    'status': new_status
+                }
+                update_record('timeline', update_data, 'id = %s', (item['id'],))
+                show_success("Milestone updated!")
+                st.rerun()
+        
+        with col_delete:
+            if st.button("🗑️ Delete", key=f"del_time_{key_suffix}"):
+                delete_record('timeline', 'id = %s', (item['id'],))
+                show_success("Milestone deleted!")
+                st.rerun()
+
 # =====================================================
 # 9. CLIENT FEEDBACK & APPROVALS
 # =====================================================
@@ -1077,10 +1211,6 @@ Designer Feedback Module
 View client feedback and approval statuses
 """
 
-import streamlit as st
-from database import get_records, execute_query
-from utils import format_datetime, show_info
-
 def show_feedback_approvals():
     """
     Display client feedback and approval statuses
@@ -1088,55 +1218,66 @@ def show_feedback_approvals():
     """
     st.header("💬 Client Feedback & Approvals")
     
-    project_id = st.session_state.get('active_project_id')
-    if not project_id:
+    project = st.session_state.get('active_project')
+    if not project:
         show_info("Please select a project from Project Management first")
         return
     
-    st.subheader(f"Project: {st.session_state.get('active_project_name', 'N/A')}")
+    project_id = project['id']
+    st.subheader(f"Project: {project['name']}")
     
-    # Get all feedback items
-    feedback_items = get_records('feedback', 
-                                'project_id = %s ORDER BY created_at DESC', 
-                                (project_id,))
+    # Gate on the rows themselves, not on the trigger-maintained counts
+    has_feedback = bool(cached_get_records('feedback', 'project_id = %s', (project_id,),
+                                           columns='id', limit=1))
     
-    if feedback_items:
-        # Summary metrics
+    if has_feedback:
+        # Summary metrics (read from feedback_summary)
+        status_counts = get_feedback_status_counts(project_id)
         col1, col2, col3 = st.columns(3)
         
-        approved = len([f for f in feedback_items if f['approval_status'] == 'approved'])
-        pending = len([f for f in feedback_items if f['approval_status'] == 'pending'])
-        rejected = len([f for f in feedback_items if f['approval_status'] == 'rejected'])
-        
         with col1:
-            st.metric("✅ Approved", approved)
+            st.metric("✅ Approved", status_counts['approved'])
         with col2:
-            st.metric("⏳ Pending", pending)
+            st.metric("⏳ Pending", status_counts['pending'])
         with col3:
-            st.metric("❌ Rejected", rejected)
+            st.metric("❌ Rejected", status_counts['rejected'])
         
         st.divider()
         
         # Display feedback items
         st.subheader("📝 Feedback History")
         
-        for feedback in feedback_items:
-            status_emoji = {
-                'approved': '✅',
-                'pending': '⏳',
-                'rejected': '❌'
-            }
+        # Only fetch the full history when it is asked for
+        feedback_items, has_older, cursors = [], False, [None]
+        if st.toggle("Show history", key=f"show_feedback_history_{project_id}"):
+            # Keyset pagination: each page starts after the last (created_at, id)
+            # of the previous one, so deep pages cost the same as the first
+            cursors = st.session_state.setdefault(f'feedback_cursors_{project_id}', [None])
+            if cursors[-1] is None:
+                condition, params = 'project_id = %s', (project_id,)
+            else:
+                last_created, last_id = cursors[-1]
+                condition = 'project_id = %s AND (created_at < %s OR (created_at = %s AND id < %s))'
+                params = (project_id, last_created, last_created, last_id)
             
-            status_color = {
-                'approved': 'green',
-                'pending': 'orange',
-                'rejected': 'red'
-            }
+            # Fetch one extra row to know whether an older page exists
+            feedback_items = cached_get_records('feedback', condition, params,
+                                               order_by='created_at DESC, id DESC',
+                                               limit=config.LIST_PAGE_SIZE + 1)
+            has_older = len(feedback_items) > config.LIST_PAGE_SIZE
+            feedback_items = feedback_items[:config.LIST_PAGE_SIZE]
+        
+        for feedback in feedback_items:
+            status = feedback['approval_status']
+            item_type = format_label(feedback['item_type'])
+            created = format_datetime(feedback['created_at'])
             
-            with st.expander(f"{status_emoji[feedback['approval_status']]} {feedback['item_type'].title()} Feedback - {format_datetime(feedback['created_at'])}"):
-                st.markdown(f"**Type:** {feedback['item_type'].title()}")
-                st.markdown(f"**Status:** :{status_color[feedback['approval_status']]}[{feedback['approval_status'].title()}]")
-                st.markdown(f"**Date:** {format_datetime(feedback['created_at'])}")
+            with st.expander(f"{config.FEEDBACK_STATUS_EMOJI[status]} {item_type} Feedback - {created}"):
+                st.markdown(
+                    f"**Type:** {item_type}\n\n"
+                    f"**Status:** :{config.FEEDBACK_STATUS_COLOR[status]}[{format_label(status)}]\n\n"
+                    f"**Date:** {created}"
+                )
                 
                 if feedback['comment']:
                     st.markdown("### Client Comment:")
@@ -1145,8 +1286,19 @@ def show_feedback_approvals():
                     st.markdown("*No comment provided*")
                 
                 # If rejected, highlight it
-                if feedback['approval_status'] == 'rejected':
+                if status == 'rejected':
                     st.error("⚠️ This item requires attention - client has rejected it")
+        
+        if has_older or len(cursors) > 1:
+            col_newer, col_older = st.columns(2)
+            with col_newer:
+                if len(cursors) > 1:
+                    st.button("⬅️ Newer", key=f"feedback_newer_{project_id}", on_click=cursors.pop)
+            with col_older:
+                if has_older:
+                    last = feedback_items[-1]
+                    st.button("Older ➡️", key=f"feedback_older_{project_id}", on_click=cursors.append,
+                              args=((last['created_at'], last['id']),))
     else:
         show_info("No feedback from client yet. Client can provide feedback from their dashboard.")
     
@@ -3,10 +3,14 @@ Utility Functions Module
 Helper functions for file uploads, image handling, and common operations
 """
 
+import io
 import os
+import re
 import shutil
-from datetime import datetime
-from PIL import Image
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from PIL import Image, ImageOps
 import streamlit as st
 import config
 
@@ -14,12 +18,73 @@ import config
 # FILE UPLOAD HELPERS
 # =====================================================
 
+def get_upload_directory(project_id, file_type):
+    """
+    Resolve (and create) the storage directory for a project's file type
+    
+    Args:
+        project_id: Project ID for organizing files
+        file_type: Type of file ('reference', 'drawing', 'gallery', 'whiteboard')
+    
+    Returns:
+        Absolute directory path
+    """
+    if file_type == 'reference':
+        directory = config.REFERENCE_LIBRARY_DIR.format(project_id=project_id)
+    elif file_type == 'drawing':
+        directory = config.DRAWINGS_DIR.format(project_id=project_id)
+    elif file_type == 'gallery':
+        directory = config.GALLERY_DIR.format(project_id=project_id)
+    elif file_type == 'whiteboard':
+        directory = config.WHITEBOARD_DIR.format(project_id=project_id)
+    else:
+        directory = os.path.join(config.BASE_UPLOAD_DIR, 'projects', str(project_id), 'misc')
+    
+    # Create directory if it doesn't exist
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+def unique_file_prefix():
+    """
+    Timestamp prefix that keeps stored filenames unique
+    Microsecond resolution, so files saved within the same second
+    (e.g. a multi-file upload) no longer share a prefix
+    
+    Returns:
+        Hex string of the current time in microseconds (sorts chronologically)
+    """
+    return f"{time.time_ns() // 1000:x}"
+
+def save_image(image, project_id, file_type, name, **save_options):
+    """
+    Save a PIL image straight to project storage (no upload object needed)
+    
+    Args:
+        image: PIL Image object
+        project_id: Project ID for organizing files
+        file_type: Type of file ('reference', 'drawing', 'gallery', 'whiteboard')
+        name: Base filename; the format is taken from its extension
+        **save_options: Extra encoder options passed to Image.save
+    
+    Returns:
+        Relative file path or None if error
+    """
+    try:
+        directory = get_upload_directory(project_id, file_type)
+        filepath = os.path.join(directory, f"{unique_file_prefix()}_{name}")
+        
+        image.save(filepath, **save_options)
+        return os.path.relpath(filepath, config.BASE_UPLOAD_DIR)
+    except Exception as e:
+        st.error(f"Error saving image: {e}")
+        return None
+
 def save_uploaded_file(uploaded_file, project_id, file_type='reference'):
     """
     Save an uploaded file to the appropriate directory
     
     Args:
-        uploaded_file: Streamlit UploadedFile object
+        uploaded_file: Streamlit UploadedFile or other named, seekable file object
         project_id: Project ID for organizing files
         file_type: Type of file ('reference', 'drawing', 'gallery', 'whiteboard')
     
@@ -27,40 +92,97 @@ def save_uploaded_file(uploaded_file, project_id, file_type='reference'):
         Relative file path or None if error
     """
     try:
-        # Determine directory based on file type
-        if file_type == 'reference':
-            directory = config.REFERENCE_LIBRARY_DIR.format(project_id=project_id)
-        elif file_type == 'drawing':
-            directory = config.DRAWINGS_DIR.format(project_id=project_id)
-        elif file_type == 'gallery':
-            directory = config.GALLERY_DIR.format(project_id=project_id)
-        elif file_type == 'whiteboard':
-            directory = config.WHITEBOARD_DIR.format(project_id=project_id)
-        else:
-            directory = os.path.join(config.BASE_UPLOAD_DIR, 'projects', str(project_id), 'misc')
-        
-        # Create directory if it doesn't exist
-        os.makedirs(directory, exist_ok=True)
-        
-        # Generate unique filename with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{timestamp}_{uploaded_file.name}"
-        filepath = os.path.join(directory, filename)
-        
-        # Save file
-        with open(filepath, 'wb') as f:
-            f.write(uploaded_file.getbuffer())
-        
-        # Return relative path for database storage
-        relative_path = os.path.relpath(filepath, config.BASE_UPLOAD_DIR)
-        return relative_path
+        return store_uploaded_file(uploaded_file, project_id, file_type)
     except Exception as e:
         st.error(f"Error saving file: {e}")
         return None
 
+def save_uploaded_files(uploaded_files, project_id, file_type, max_workers=4):
+    """
+    Save several uploaded files concurrently
+    Workers never call Streamlit (elements from threads without a script
+    run context are dropped), so failures are returned for the caller to show
+    
+    Args:
+        uploaded_files: List of uploaded file objects
+        project_id: Project ID for organizing files
+        file_type: Type of file ('reference', 'gallery')
+        max_workers: Number of files written at once
+    
+    Returns:
+        Tuple (file_paths: list of saved relative paths, errors: list of messages)
+    """
+    def save(uploaded_file):
+        try:
+            return store_uploaded_file(uploaded_file, project_id, file_type), None
+        except Exception as e:
+            return None, f"{uploaded_file.name}: {e}"
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(save, uploaded_files))
+    
+    file_paths = [file_path for file_path, _ in results if file_path]
+    errors = [error for _, error in results if error]
+    return file_paths, errors
+
+def store_uploaded_file(uploaded_file, project_id, file_type):
+    """
+    Write an uploaded file to project storage without touching the UI
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile or other named, seekable file object
+        project_id: Project ID for organizing files
+        file_type: Type of file ('reference', 'drawing', 'gallery', 'whiteboard')
+    
+    Returns:
+        Relative file path
+    
+    Raises:
+        Exception if the file type is not allowed or the file cannot be written
+    """
+    allowed_extensions = config.UPLOAD_EXTENSIONS.get(file_type)
+    if allowed_extensions and not is_valid_file_extension(uploaded_file.name, allowed_extensions):
+        raise ValueError(f"{uploaded_file.name} is not an allowed file type")
+    
+    directory = get_upload_directory(project_id, file_type)
+    
+    # Generate unique filename with timestamp
+    filename = f"{unique_file_prefix()}_{uploaded_file.name}"
+    stem, extension = os.path.splitext(filename)
+    extension = extension[1:].lower()
+    
+    image = None
+    if file_type in config.WEBP_FILE_TYPES and extension in config.WEBP_SOURCE_EXTENSIONS:
+        # Store gallery/reference photos as WebP (much smaller than JPEG/PNG)
+        # WebP keeps no EXIF orientation, so rotate phone photos upright first
+        image = ImageOps.exif_transpose(Image.open(uploaded_file))
+        if image.mode not in ('RGB', 'RGBA'):
+            has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+        filepath = os.path.join(directory, f"{stem}.webp")
+        image.save(filepath, format='WEBP', quality=config.WEBP_QUALITY, method=4)
+    else:
+        filepath = os.path.join(directory, filename)
+        
+        # Stream to disk in 1 MB chunks; any file-like object with read() works
+        uploaded_file.seek(0)
+        with open(filepath, 'wb') as f:
+            shutil.copyfileobj(uploaded_file, f, length=1024 * 1024)
+    
+    # Return relative path for database storage
+    relative_path = os.path.relpath(filepath, config.BASE_UPLOAD_DIR)
+    
+    # Pre-generate a thumbnail so grid views never decode the original
+    if image is not None or extension in config.ALLOWED_IMAGE_EXTENSIONS:
+        create_thumbnail_file(relative_path, image)
+    
+    return relative_path
+
+@lru_cache(maxsize=1024)
 def get_full_file_path(relative_path):
     """
     Convert relative file path to full absolute path
+    Memoized: stored paths never change, and image lists resolve them every rerun
     
     Args:
         relative_path: Relative path stored in database
@@ -84,6 +206,11 @@ def delete_file(relative_path):
         full_path = get_full_file_path(relative_path)
         if os.path.exists(full_path):
             os.remove(full_path)
+        
+        # Remove the matching thumbnail, if any
+        thumbnail_path = get_full_file_path(get_thumbnail_path(relative_path))
+        if os.path.exists(thumbnail_path):
+            os.remove(thumbnail_path)
         return True
     except Exception as e:
         print(f"Error deleting file: {e}")
@@ -105,28 +232,99 @@ def display_image(file_path, caption=None, width=None):
     try:
         full_path = get_full_file_path(file_path)
         if os.path.exists(full_path):
-            st.image(full_path, caption=caption, width=width)
+            thumbnail_path = get_full_file_path(get_thumbnail_path(file_path))
+            if width and width <= config.THUMBNAIL_SIZE[0] and os.path.exists(thumbnail_path):
+                # Use the thumbnail written at upload time
+                st.image(thumbnail_path, caption=caption, width=width)
+            elif width:
+                # Fixed-width displays only need a downscaled copy
+                thumbnail = get_cached_thumbnail(full_path, os.path.getmtime(full_path), width)
+                st.image(thumbnail or full_path, caption=caption, width=width)
+            else:
+                st.image(full_path, caption=caption, width=width)
         else:
             st.warning("Image file not found")
     except Exception as e:
         st.error(f"Error displaying image: {e}")
 
-def get_image_thumbnail(file_path, size=(200, 200)):
+def get_thumbnail_path(relative_path):
     """
-    Create and return thumbnail of an image
+    Get the relative path of an image's stored thumbnail
+    Thumbnails live in a 'thumbs' folder next to the original
     
     Args:
-        file_path: Path to image file
-        size: Tuple of (width, height) for thumbnail
+        relative_path: Relative path of the original image
+    
+    Returns:
+        Relative thumbnail path
+    """
+    directory, filename = os.path.split(relative_path)
+    return os.path.join(directory, 'thumbs', f"{filename}.jpg")
+
+def create_thumbnail_file(relative_path, image=None):
+    """
+    Write a downscaled JPEG thumbnail of an image to disk
+    
+    Args:
+        relative_path: Relative path of the original image
+        image: Optional already-decoded PIL image (avoids reading the file again)
     
     Returns:
-        PIL Image object or None
+        Relative thumbnail path or None if error
     """
     try:
-        full_path = get_full_file_path(file_path)
-        img = Image.open(full_path)
-        img.thumbnail(size)
-        return img
+        thumbnail_path = get_thumbnail_path(relative_path)
+        full_thumbnail_path = get_full_file_path(thumbnail_path)
+        os.makedirs(os.path.dirname(full_thumbnail_path), exist_ok=True)
+        
+        if image is None:
+            with Image.open(get_full_file_path(relative_path)) as source:
+                img = source.copy()
+        else:
+            img = image.copy()
+        
+        img.thumbnail(config.THUMBNAIL_SIZE)
+        if img.mode in ('RGBA', 'LA', 'P'):
+            # JPEG has no alpha channel, flatten onto white
+            img = img.convert('RGBA')
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=img.getchannel('A'))
+            img = background
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+        img.save(full_thumbnail_path, format='JPEG', quality=82, optimize=True)
+        
+        return thumbnail_path
+    except Exception as e:
+        print(f"Error creating thumbnail file: {e}")
+        return None
+
+@st.cache_data(show_spinner=False)
+def get_cached_thumbnail(full_path, mtime, width):
+    """
+    Create an encoded thumbnail of an image, cached across reruns
+    
+    Args:
+        full_path: Absolute path to image file
+        mtime: File modification time (part of the cache key so edits refresh)
+        width: Maximum thumbnail width/height in pixels
+    
+    Returns:
+        Encoded image bytes or None if the image can't be read
+    """
+    try:
+        with Image.open(full_path) as img:
+            img.thumbnail((width, width))
+            if img.mode in ('RGBA', 'LA', 'P'):
+                image_format = 'PNG'
+            else:
+                image_format = 'JPEG'
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
+            
+            buffer = io.BytesIO()
+            img.save(buffer, format=image_format)
+            return buffer.getvalue()
     except Exception as e:
         print(f"Error creating thumbnail: {e}")
         return None
@@ -135,6 +333,19 @@ def get_image_thumbnail(file_path, size=(200, 200)):
 # VALIDATION HELPERS
 # =====================================================
 
+@lru_cache(maxsize=32)
+def normalize_extensions(allowed_extensions):
+    """
+    Build (and memoize) a lowercase set of extensions for O(1) lookups
+    
+    Args:
+        allowed_extensions: Tuple of extensions (without dots)
+    
+    Returns:
+        frozenset of lowercase extensions
+    """
+    return frozenset(ext.lower() for ext in allowed_extensions)
+
 def is_valid_file_extension(filename, allowed_extensions):
     """
     Check if file has an allowed extension
@@ -146,8 +357,11 @@ def is_valid_file_extension(filename, allowed_extensions):
     Returns:
         Boolean
     """
-    extension = filename.split('.')[-1].lower()
-    return extension in [ext.lower() for ext in allowed_extensions]
+    extension = filename.rsplit('.', 1)[-1].lower()
+    return extension in normalize_extensions(tuple(allowed_extensions))
+
+# Compiled once at import; used by validate_email
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
 def validate_email(email):
     """
@@ -159,9 +373,7 @@ def validate_email(email):
     Returns:
         Boolean
     """
-    import re
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return EMAIL_PATTERN.match(email) is not None
 
 def validate_password(password):
     """
@@ -181,7 +393,9 @@ def validate_password(password):
 # =====================================================
 # FORMATTING HELPERS
 # =====================================================
+# Pure functions of hashable values, memoized across reruns
 
+@lru_cache(maxsize=4096)
 def format_currency(amount):
     """
     Format number as currency
@@ -194,6 +408,11 @@ def format_currency(amount):
     """
     return f"₹{amount:,.2f}"
 
+# Month abbreviations for format_date (fixed English, independent of locale)
+MONTH_ABBREVIATIONS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                       'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+@lru_cache(maxsize=4096)
 def format_date(date_obj):
     """
     Format date object to readable string
@@ -205,9 +424,11 @@ def format_date(date_obj):
         Formatted date string
     """
     if date_obj:
-        return date_obj.strftime('%d %b %Y')
+        # Same output as strftime('%d %b %Y') without the format parser
+        return f"{date_obj.day:02d} {MONTH_ABBREVIATIONS[date_obj.month - 1]} {date_obj.year}"
     return 'Not set'
 
+@lru_cache(maxsize=4096)
 def format_datetime(datetime_obj):
     """
     Format datetime object to readable string
@@ -222,6 +443,19 @@ def format_datetime(datetime_obj):
         return datetime_obj.strftime('%d %b %Y, %I:%M %p')
     return 'Not set'
 
+@lru_cache(maxsize=64)
+def format_label(value):
+    """
+    Format a stored enum value for display (e.g., 'in_progress' -> 'In Progress')
+    
+    Args:
+        value: Status or type string from the database
+    
+    Returns:
+        Title-cased label
+    """
+    return value.replace('_', ' ').title()
+
 # =====================================================
 # PROJECT HELPERS
 # =====================================================
@@ -252,8 +486,13 @@ def create_project_directories(project_id):
         config.WHITEBOARD_DIR.format(project_id=project_id)
     ]
     
+    # Walk the shared parent path once; the leaves then need a single mkdir each
+    os.makedirs(get_project_directory(project_id), exist_ok=True)
     for directory in directories:
-        os.makedirs(directory, exist_ok=True)
+        try:
+            os.mkdir(directory)
+        except FileExistsError:
+            pass
 
 def delete_project_files(project_id):
     """
@@ -266,9 +505,10 @@ def delete_project_files(project_id):
         Boolean indicating success
     """
     try:
-        project_dir = get_project_directory(project_id)
-        if os.path.exists(project_dir):
-            shutil.rmtree(project_dir)
+        shutil.rmtree(get_project_directory(project_id))
+        return True
+    except FileNotFoundError:
+        # Nothing stored for this project
         return True
     except Exception as e:
         print(f"Error deleting project files: {e}")
@@ -294,24 +534,29 @@ def show_warning(message):
     """Display warning message"""
     st.warning(f"⚠ {message}")
 
-def create_card(title, content, color="lightblue"):
+def show_page_selector(total_rows, key, page_size=None):
     """
-    Create a styled card/box for displaying information
+    Show a page number input when a list spans more than one page
     
     Args:
-        title: Card title
-        content: Card content (can be HTML)
-        color: Background color
-    """
-    st.markdown(
-        f"""
-        <div style="background-color: {color}; padding: 20px; border-radius: 10px; margin: 10px 0;">
-            <h3 style="margin: 0 0 10px 0;">{title}</h3>
-            <div>{content}</div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+        total_rows: Total number of rows in the list
+        key: Unique widget key for this list
+        page_size: Rows per page (default: config.LIST_PAGE_SIZE)
+    
+    Returns:
+        Tuple of (limit, offset) to pass to get_records
+    """
+    page_size = page_size or config.LIST_PAGE_SIZE
+    page_count = max(1, -(-total_rows // page_size))
+    
+    page = 1
+    if page_count > 1:
+        # Clamp a page left over from before rows were deleted
+        if st.session_state.get(key, 1) > page_count:
+            st.session_state[key] = page_count
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count,
+                               step=1, key=key)
+    return page_size, (page - 1) * page_size
 
 # =====================================================
 # STATISTICS HELPERS
@@ -327,8 +572,12 @@ def calculate_budget_statistics(budget_items):
     Returns:
         Dictionary with statistics
     """
-    total_estimated = sum(item.get('estimated_cost', 0) for item in budget_items)
-    total_actual = sum(item.get('actual_cost', 0) for item in budget_items)
+    # One pass over the items for both totals (DECIMAL columns arrive as Decimal)
+    total_estimated = total_actual = 0.0
+    for item in budget_items:
+        total_estimated += float(item.get('estimated_cost') or 0)
+        total_actual += float(item.get('actual_cost') or 0)
+    
     difference = total_actual - total_estimated
     
     return {
@@ -337,19 +586,3 @@ def calculate_budget_statistics(budget_items):
         'difference': difference,
         'over_budget': difference > 0
     }
-
-def calculate_task_completion(tasks):
-    """
-    Calculate overall task completion percentage
-    
-    Args:
-        tasks: List of task dictionaries
-    
-    Returns:
-        Average completion percentage
-    """
-    if not tasks:
-        return 0
-    
-    total_progress = sum(task.get('progress_percent', 0) for task in tasks)
-    return total_progress / len(tasks)